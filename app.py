@@ -27,13 +27,25 @@ from streamlit_local_storage import LocalStorage
 from cryptography.fernet import Fernet
 
 # Functions for description addition process
-from helpers import generate_description, generate_table, process_publish_descriptions, change_page_to, show_problems, review_descriptions
+from helpers import generate_description, generate_table, process_publish_descriptions, change_page_to, show_problems, review_descriptions, show_skipped_rows, show_collapsed_titles
+
+# For checking the uploaded tables
+from csv_ingestion import has_required_columns
+
+# For choosing the dump files stored on the server
+from pageview_dump import DUMP_DIRECTORY, list_dump_files, resolve_dump_file
 
 from styling_functions import css_styling, category_chip, app_header, maintenance_banner
 
 # Functions for login - authentication process
 from login_process import authorization_setup, get_access_token_and_verify_user, login_with_oauth_params, log_out
 
+# For sharing the sites used for reading between users
+from site_registry import get_read_site
+
+# For checking the category with one request
+from wikimedia_api import get_category_info
+
 
 # Initialize local storage component
 localStorage = LocalStorage()
@@ -170,21 +182,17 @@ def verify_category():
     # While the spinner is showing
     with st.spinner(_("Searching through all pages in the category", "cateogry_article_search")):
         # Set the site to Slovak Wikipedia
-        site = pywikibot.Site(__("en", "lang"), "wikipedia")
+        site = get_read_site(__("en", "lang"), "wikipedia")
         print("Category: ", st.session_state["category"])
         # Set the inputted category as the category to be accessed
         cat = pywikibot.Category(site, st.session_state["category"])
-        # If subcategories are not selected
-        if st.session_state["subcategories_enabled"] == False:
-            # List only pages in the category
-            cat = list(cat.articles())
-        # If subcategories are selected
-        if st.session_state["subcategories_enabled"] == True:
-            # List pages within the category and pages of n-th subcategories
-            cat = list(cat.articles(recurse=st.session_state["subcategory_recurse"]))
-        print("Category list: ", cat)
-        # If there is no page in inputted category
-        if len(cat) == 0:
+        # Get only the numbers of pages, subcategories and files in the category, the pages themselves are listed
+        # when the table is generated
+        category_info = get_category_info(cat.title(), __("en", "lang"), st.session_state["headers"])
+        print("Category info: ", category_info)
+        # If there is no page in inputted category (and no subcategory when subcategories are selected)
+        if category_info is None or (category_info["pages"] == 0 and
+                                     (st.session_state["subcategories_enabled"] == False or category_info["subcats"] == 0)):
             # Show to user the category does not exist
             st.session_state["category_verified"] = False
             st.session_state["invalid_category"] = st.session_state["category"]
@@ -192,8 +200,15 @@ def verify_category():
         else:
             # Show to user the category exists
             st.session_state["category_verified"] = True
-            # Save the category
+            # Save the category and its numbers of members
             st.session_state["category_object"] = cat
+            st.session_state["category_info"] = category_info
+            # If subcategories are not selected, list only pages in the category,
+            # otherwise list pages within the category and pages of n-th subcategories
+            if st.session_state["subcategories_enabled"] == False:
+                st.session_state["category_recurse"] = False
+            else:
+                st.session_state["category_recurse"] = st.session_state["subcategory_recurse"]
 
 
 st.session_state["headers"] = {
@@ -922,6 +937,10 @@ if "logged_in" in st.session_state:
 """
                 ):
                     st.success(_("Category **{category}** exists.", "category_exists", category=st.session_state["category"]))
+                # Show the numbers of members of the category
+                st.caption(_("It contains {pages} pages, {subcats} subcategories and {files} files.", "category_member_counts",
+                             pages=st.session_state["category_info"]["pages"], subcats=st.session_state["category_info"]["subcats"],
+                             files=st.session_state["category_info"]["files"]))
                 # Show continue button
                 st.button(_("Continue", "continue"), on_click=lambda: change_page_to(page="Category", page_step=2), key="button_4")
             # If category does not exist
@@ -1175,6 +1194,39 @@ if "logged_in" in st.session_state:
 
             # Add csv upload button
                 st.session_state["csv"] = st.file_uploader(" ", accept_multiple_files=False, type="csv")
+                # Check only the header of the file, the rows are read when generating table
+                if st.session_state["csv"] is not None and not has_required_columns(st.session_state["csv"], ["Page"]):
+                    st.error(_("The column with Wikipedia page names has to have a title 'Page'. Upload another file, please.",
+                               "popular_file_upload_error"))
+                    st.session_state["csv"] = None
+
+                # Instead of the csv file, a dump file stored on the server can be used: a pageview dump, from which
+                # the most viewed pages are taken, or a Wikidata JSON dump, from which the items without a description
+                # are taken
+                with st.expander(_("Use a dump file stored on the server", "dump_file_expander")):
+                    dump_file_type = st.radio(_("Type of the dump file", "dump_file_type"),
+                                              options=["pageview_dump", "wikidata_dump"],
+                                              format_func=lambda option: {
+                                                  "pageview_dump": _("Pageview dump", "dump_file_type_pageview"),
+                                                  "wikidata_dump": _("Wikidata JSON dump", "dump_file_type_wikidata"),
+                                              }[option], key="radio_dump_file_type")
+                    # Only the files in the dump directory of the server can be chosen
+                    dump_directory = pathlib.Path(st.secrets.get("DUMP_DIRECTORY", DUMP_DIRECTORY))
+                    dump_file_name = st.selectbox(_("Dump file", "dump_file_name"), list_dump_files(dump_directory),
+                                                  key="selectbox_dump_file")
+                    if dump_file_type == "pageview_dump":
+                        dump_file_top_n = st.number_input(_("Number of most viewed pages", "pageview_dump_top_n"),
+                                                          value=1000, min_value=1, max_value=100000,
+                                                          key="number-input_pageview_dump")
+                    else:
+                        dump_file_top_n = None
+                    use_dump_file = st.button(_("Use dump file", "dump_file_button"), key="button_dump_file")
+                    if use_dump_file:
+                        try:
+                            dump_file_path = resolve_dump_file(dump_file_name, dump_directory)
+                        except (TypeError, ValueError):
+                            st.error(_("The file does not exist.", "dump_file_not_found"))
+                            use_dump_file = False
 
                 st.session_state["max_rows_in_table_enabled"] = st.toggle(
                     _("Limit amount of rows in table", "max_rows_table_toggle"),
@@ -1187,8 +1239,12 @@ if "logged_in" in st.session_state:
                         key="text-input_4")
                 st.button(_("Back", "back"), on_click=lambda: change_page_to(page="Choose_method"), key="button_64")
 
-            # If user uploaded csv file
-            if st.session_state["csv"] is not None and "review_descriptions" not in st.session_state:
+            # If user chose a dump file, read its pages when generating table
+            if use_dump_file:
+                st.session_state["dump_file"] = {"type": dump_file_type, "path": dump_file_path, "top_n": dump_file_top_n}
+
+            # If user uploaded csv file or chose a dump file
+            if (st.session_state["csv"] is not None or use_dump_file) and "review_descriptions" not in st.session_state:
                 # Remove content of step 1 page
                 st.session_state["container_popular_step_1"].empty()
                 # Change to step 2 of the process so that the step 2 page gets shown
@@ -1200,11 +1256,17 @@ if "logged_in" in st.session_state:
             st.subheader(_("Step {current_step} of {all_steps}: Prepare descriptions", "prepare_descriptions", current_step="2", all_steps="4"), divider="grey")
             # And the method has not run ýet
             if "program_run_already" not in st.session_state:
-                generate_table(st.session_state["csv"], "table")
+                if st.session_state["csv"] is None and "dump_file" in st.session_state:
+                    generate_table(st.session_state["dump_file"], st.session_state["dump_file"]["type"])
+                else:
+                    generate_table(st.session_state["csv"], "table")
                 st.rerun()
             else:
                 st.text(
                     _("Double-click the cell with the suggested description and enter the final version.", "prepare_descriptions_instruction"))
+                # Show the rows of the uploaded file which could not be read and the titles which were merged or left out
+                show_skipped_rows()
+                show_collapsed_titles()
                 # Display the resulting dataframe in a form where the description is editable
                 edited_table = st.data_editor(st.session_state["table"], column_config={
                     "Page name": st.column_config.TextColumn(
@@ -1227,7 +1289,7 @@ if "logged_in" in st.session_state:
                 with col1:
                     st.button(_("Back", "back"),
                               on_click=lambda: change_page_to(page="Popular", page_step=1,
-                                                              delete="program_run_already"),
+                                                              delete="program_run_already", delete_1="dump_file"),
                               key="button_72")
                 with col2:
                     # Create stylable container to align the button in it to the right of the column (and the page)
@@ -1304,16 +1366,13 @@ if "logged_in" in st.session_state:
 
             # If user uploaded csv file
             if st.session_state["csv"] is not None and "review_descriptions" not in st.session_state:
-                try:
-                    # Check if Pandas can read the file
-                    pd.read_csv(st.session_state["csv"], encoding='utf-8')
-                    # Reset the file pointer to the beginning so it can be read again by pandas when generating table
-                    st.session_state["csv"].seek(0)
+                # Check only the header of the file, the rows are read when generating table
+                if has_required_columns(st.session_state["csv"], ["Page", "Description"]):
                     # Remove content of step 1 page
                     st.session_state["container_file_step_1"].empty()
                     # Change to step 2 of the process so that the step 2 page gets shown
                     st.session_state["page_step"] = 2
-                except:
+                else:
                     st.session_state["page_step"] = "1error"
                 # Rerun the code so that it goes to the page step 2
                 st.rerun()
@@ -1378,6 +1437,9 @@ if "logged_in" in st.session_state:
                 st.text(
                     _("Double-click the cell with the suggested description and enter the final version.",
                       "prepare_descriptions_instruction"))
+                # Show the rows of the uploaded file which could not be read and the titles which were merged or left out
+                show_skipped_rows()
+                show_collapsed_titles()
                 # Display the resulting dataframe in a form where the description is editable
                 edited_table = st.data_editor(st.session_state["table"], column_config={
                     "Page name": st.column_config.TextColumn(
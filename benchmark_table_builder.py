@@ -0,0 +1,50 @@
+# Micro-benchmark comparing building the table of descriptions row by row with pd.concat
+# (as generate_table did before) with the column by column TableBuilder.
+# Run with: python benchmark_table_builder.py [number of rows ...]
+import sys
+import time
+
+import pandas as pd
+
+from table_builder import TableBuilder
+
+
+# Function to create the values of one row of the table
+def example_row(i: int) -> dict:
+    return {"Page name": f"Page {i}", "URL": f"https://en.wikipedia.org/wiki/Page_{i}",
+            "Wikidata Object": f"https://www.wikidata.org/wiki/Q{i}", "Wikipedia article": f"description {i}",
+            "Wikidata revision": f"{1000 + i}"}
+
+
+# Function to build the table row by row with pd.concat
+def build_with_concat(number_of_rows: int) -> pd.DataFrame:
+    df = pd.DataFrame({"Page name": [], "Wikidata Object": []})
+    for i in range(number_of_rows):
+        df = pd.concat([df, pd.DataFrame([example_row(i)])], ignore_index=True)
+    return df
+
+
+# Function to build the table with TableBuilder
+def build_with_table_builder(number_of_rows: int) -> pd.DataFrame:
+    table = TableBuilder()
+    for i in range(number_of_rows):
+        table.add_row(**example_row(i))
+    return table.to_dataframe()
+
+
+# Function to measure how long a function takes to build a table with the given number of rows
+def measure(build_function, number_of_rows: int) -> float:
+    start = time.perf_counter()
+    build_function(number_of_rows)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    row_counts = [int(argument) for argument in sys.argv[1:]] or [1_000, 10_000, 100_000]
+    # Check that both ways build the same table
+    pd.testing.assert_frame_equal(build_with_concat(100), build_with_table_builder(100))
+    print(f"{'rows':>8} {'pd.concat':>12} {'TableBuilder':>14} {'speed-up':>10}")
+    for number_of_rows in row_counts:
+        concat_seconds = measure(build_with_concat, number_of_rows)
+        builder_seconds = measure(build_with_table_builder, number_of_rows)
+        print(f"{number_of_rows:>8} {concat_seconds:>11.3f}s {builder_seconds:>13.3f}s {concat_seconds / builder_seconds:>9.1f}x")
@@ -0,0 +1,159 @@
+# For describing the members of a category
+from typing import NamedTuple
+# For storing the members of a category compactly
+from array import array
+import sys
+
+# For listing the members of a category
+from wikimedia_api import api_get, wikipedia_api_url
+# For listing several subcategories at the same time
+from fetch_executor import FetchExecutor
+
+# Maximal number of pages listed from one category tree, so that very large trees do not use too much memory
+# or too many requests
+MAX_CATEGORY_MEMBERS = 50_000
+
+
+# Namespace of categories
+CATEGORY_NAMESPACE = 14
+
+
+# Page found in a category tree, depth is 0 for pages in the category itself, 1 for pages in its subcategories etc.
+# qid is the Wikidata item of the page, or "" if the page has no item
+class CategoryMember(NamedTuple):
+    pageid: int
+    title: str
+    depth: int
+    qid: str
+
+
+# Function to list all members (pages, files and subcategories) of one category, following the API continuation.
+# The Wikidata item of every member is requested in the same request (page property wikibase_item),
+# so the members do not have to be looked up on Wikidata one more time.
+def list_category_members(category_title: str, lang: str, headers: dict):
+    params = {
+        "action": "query",
+        "generator": "categorymembers",
+        "gcmtitle": category_title,
+        "gcmtype": "page|file|subcat",
+        "gcmlimit": "max",
+        "prop": "pageprops",
+        "ppprop": "wikibase_item",
+    }
+    # Members of the current batch of the generator, if their page properties come in several responses
+    members = {}
+    while True:
+        data = api_get(wikipedia_api_url(lang), params, headers)
+        for page in data.get("query", {}).get("pages", []):
+            if page["pageid"] in members:
+                members[page["pageid"]].setdefault("pageprops", {}).update(page.get("pageprops", {}))
+            else:
+                members[page["pageid"]] = page
+        continuation = data.get("continue", {})
+        # The batch is complete when only the generator itself continues
+        if not set(continuation) - {"continue", "gcmcontinue"}:
+            for member in members.values():
+                yield {"pageid": member["pageid"], "title": member["title"],
+                       "type": "subcat" if member["ns"] == CATEGORY_NAMESPACE else "page",
+                       "qid": member.get("pageprops", {}).get("wikibase_item", "")}
+            members = {}
+        if not continuation:
+            return
+        params = {**params, **continuation}
+
+
+# Function to list all members of one category at once, runs in the threads of the executor
+def list_all_category_members(category_title: str, lang: str, headers: dict) -> list:
+    return list(list_category_members(category_title, lang, headers))
+
+
+# Function to go through a category and its subcategories (up to max_depth levels deep) breadth-first
+# and yield every page only once, as soon as it is listed.
+# Categories which were already listed (e.g. because of a cycle of subcategories or a subcategory which is
+# in several categories of the tree) are not listed again, and at most max_members pages are yielded.
+# If an executor is given, the categories of one level of the tree are listed at the same time, but the pages
+# are still yielded in the same order as when they are listed one after another.
+def traverse_category(category_title: str, lang: str, headers: dict, max_depth: int = 0,
+                      max_members: int = MAX_CATEGORY_MEMBERS, executor: FetchExecutor = None):
+    visited_categories = {category_title}
+    seen_pageids = set()
+    level = [category_title]
+    depth = 0
+    while level:
+        # A single category (e.g. the category itself) is listed page by page, so that its first pages
+        # are yielded before the whole category is listed
+        if executor is None or len(level) == 1:
+            members_of_categories = (list_category_members(category, lang, headers) for category in level)
+        else:
+            members_of_categories = executor.imap(lambda category: list_all_category_members(category, lang, headers),
+                                                  level)
+        next_level = []
+        for members in members_of_categories:
+            for member in members:
+                if member["type"] == "subcat":
+                    # Remember the subcategory to list it after all categories of the current depth
+                    if depth < max_depth and member["title"] not in visited_categories:
+                        visited_categories.add(member["title"])
+                        next_level.append(member["title"])
+                elif member["pageid"] not in seen_pageids:
+                    seen_pageids.add(member["pageid"])
+                    yield CategoryMember(member["pageid"], member["title"], depth, member["qid"])
+                    if len(seen_pageids) >= max_members:
+                        return
+        level = next_level
+        depth += 1
+
+
+# Compact storage of the members of a category tree, kept in the session to reuse them when the table is generated
+# again for the same category and depth.
+# Page ids, numeric QIDs (0 for pages without an item) and depths are kept in typed arrays and the titles in one
+# UTF-8 string pool, which takes a small part of the memory of a list of pywikibot Page objects.
+class MemberStore:
+    def __init__(self, category_title: str, max_depth: int):
+        self.category_title = category_title
+        self.max_depth = max_depth
+        self.pageids = array("q")
+        self.qids = array("q")
+        self.depths = array("b")
+        self.title_pool = bytearray()
+        # Start of the title of every member in the pool, the last one is the end of the pool
+        self.title_offsets = array("q", [0])
+        # Whether all members of the category tree were stored
+        self.complete = False
+
+    def __len__(self):
+        return len(self.pageids)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index: int) -> CategoryMember:
+        qid = f"Q{self.qids[index]}" if self.qids[index] else ""
+        return CategoryMember(self.pageids[index], self.title(index), self.depths[index], qid)
+
+    # Function to check whether the store is for the given category and depth
+    def matches(self, category_title: str, max_depth: int) -> bool:
+        return self.category_title == category_title and self.max_depth == max_depth
+
+    def add(self, member: CategoryMember):
+        self.pageids.append(member.pageid)
+        self.qids.append(int(member.qid[1:]) if member.qid else 0)
+        self.depths.append(member.depth)
+        self.title_pool += member.title.encode("utf-8")
+        self.title_offsets.append(len(self.title_pool))
+
+    def title(self, index: int) -> str:
+        return self.title_pool[self.title_offsets[index]:self.title_offsets[index + 1]].decode("utf-8")
+
+    # Function to store the members while they are yielded, the store is complete if all of them were yielded
+    def record(self, members):
+        for member in members:
+            self.add(member)
+            yield member
+        self.complete = True
+
+    # Function to get the memory used by the store in bytes
+    def memory_bytes(self) -> int:
+        return sum(sys.getsizeof(part) for part in (self, self.pageids, self.qids, self.depths, self.title_pool,
+                                                    self.title_offsets))
@@ -0,0 +1,55 @@
+# For reading the uploaded tables
+import pandas as pd
+
+# Number of rows of the uploaded table which are read at once
+CSV_CHUNK_SIZE = 1000
+# Size of the blocks in which the lines of the uploaded file are counted
+COUNT_BLOCK_SIZE = 1024 * 1024
+
+
+# Function to check that the uploaded file is a csv file with the given columns, only its header is read
+def has_required_columns(file, columns: list) -> bool:
+    try:
+        header = pd.read_csv(file, nrows=0, encoding="utf-8")
+    # Empty file, file which is not a table or not in UTF-8
+    except (ValueError, UnicodeDecodeError, pd.errors.ParserError):
+        return False
+    finally:
+        # Reset the file pointer to the beginning so it can be read again when generating table
+        file.seek(0)
+    return set(columns) <= set(header.columns)
+
+
+# Function to count the rows of the uploaded file (without the header) without parsing it, to show the progress
+def count_rows(file) -> int:
+    lines = 0
+    for block in iter(lambda: file.read(COUNT_BLOCK_SIZE), b""):
+        lines += block.count(b"\n")
+    file.seek(0)
+    return max(lines - 1, 0)
+
+
+# Function to read the given columns of the uploaded file chunk by chunk and yield the values of every row as a tuple.
+# Malformed rows (with more fields than the header, without a page name or with bytes which are not UTF-8)
+# are not yielded, but their text is added to skipped_rows.
+def iterate_csv_rows(file, columns: list, skipped_rows: list, chunk_size: int = CSV_CHUNK_SIZE):
+    # Function called by pandas for the rows which cannot be read, they are left out of the table
+    def skip_bad_line(fields: list):
+        skipped_rows.append(",".join(fields))
+        return None
+
+    file.seek(0)
+    # The python engine is needed to get the malformed rows, all values are read as text.
+    # All columns are read (pandas does not detect rows with too many fields when usecols is given),
+    # but only chunk_size rows are kept in memory at once.
+    # Only the header is checked before, so bytes which are not UTF-8 are replaced instead of stopping the reading.
+    chunks = pd.read_csv(file, dtype=str, encoding="utf-8", encoding_errors="replace", engine="python",
+                         on_bad_lines=skip_bad_line, chunksize=chunk_size)
+    for chunk in chunks:
+        for row in zip(*(chunk[column].tolist() for column in columns)):
+            # Rows without a page name or with replaced bytes cannot be used
+            if (not isinstance(row[0], str) or row[0].strip() == "" or
+                    any(isinstance(value, str) and "\ufffd" in value for value in row)):
+                skipped_rows.append(",".join(value if isinstance(value, str) else "" for value in row))
+                continue
+            yield row
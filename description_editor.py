@@ -0,0 +1,89 @@
+# For sending the edits to the Wikidata API as the user
+import requests
+from requests_oauthlib import OAuth1
+# For describing the results of the edits
+from typing import NamedTuple
+
+# For sending the requests to the same API as the reading requests
+from wikimedia_api import WIKIDATA_API_URL, MAXLAG
+
+
+# Result of a successful edit of a description
+class EditResult(NamedTuple):
+    qid: str
+    lang: str
+    # Revision of the item after the edit
+    lastrevid: int
+    # Whether the item already had the same description, so no new revision was made
+    nochange: bool
+
+
+# Error returned by the API for an edit, code is the API error code (e.g. "maxlag", "editconflict")
+class EditError(Exception):
+    def __init__(self, code: str, info: str, retry_after: float = None):
+        super().__init__(f"{code}: {info}")
+        self.code = code
+        self.info = info
+        self.retry_after = retry_after
+
+
+# Sets descriptions of Wikidata items as one user with one POST request per edit (action=wbsetdescription),
+# without loading the items. The CSRF token of the user is requested only once and requested again
+# only when the API says that it is not valid anymore.
+class DescriptionEditor:
+    def __init__(self, credentials: dict, headers: dict):
+        self.credentials = credentials
+        self.session = requests.Session()
+        self.session.auth = OAuth1(*credentials["oauth"])
+        self.session.headers.update(headers)
+        self.csrf_token = None
+
+    # Function to send a request to the Wikidata API as the user and return the decoded response,
+    # errors of the API are raised as EditError
+    def _request(self, method: str, params: dict) -> dict:
+        params = {"format": "json", "formatversion": "2", **params}
+        if method == "GET":
+            response = self.session.get(WIKIDATA_API_URL, params=params, timeout=60)
+        else:
+            response = self.session.post(WIKIDATA_API_URL, data=params, timeout=60)
+        response.raise_for_status()
+        data = response.json()
+        if "error" in data:
+            try:
+                retry_after = float(response.headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                retry_after = None
+            raise EditError(data["error"].get("code"), data["error"].get("info", ""), retry_after)
+        return data
+
+    # Function to get the CSRF token of the user, requested only if it was not requested yet
+    def _token(self, refresh: bool = False) -> str:
+        if self.csrf_token is None or refresh:
+            data = self._request("GET", {"action": "query", "meta": "tokens", "type": "csrf"})
+            self.csrf_token = data["query"]["tokens"]["csrftoken"]
+        return self.csrf_token
+
+    # Function to set the description of an item in a language.
+    # If baserevid (the revision of the item when the table was generated) is given, the API refuses the edit
+    # with an editconflict error when the item changed in a conflicting way since then.
+    def set_description(self, qid: str, lang: str, description: str, summary: str, baserevid: int = None) -> EditResult:
+        params = {
+            "action": "wbsetdescription",
+            "id": qid,
+            "language": lang,
+            "value": description,
+            "summary": summary,
+            "maxlag": MAXLAG,
+            # Fail instead of editing without being logged in
+            "assert": "user",
+        }
+        if baserevid:
+            params["baserevid"] = baserevid
+        try:
+            data = self._request("POST", {**params, "token": self._token()})
+        except EditError as error:
+            if error.code != "badtoken":
+                raise
+            # The token is not valid anymore (e.g. the session of the user expired), get a new one and try again
+            data = self._request("POST", {**params, "token": self._token(refresh=True)})
+        return EditResult(qid, lang, data["entity"].get("lastrevid"), "nochange" in data["entity"])
@@ -0,0 +1,72 @@
+# For finding the end of the first sentence
+import regex
+# For detecting changes of the copulas used by the description extraction
+import hashlib
+
+
+# Function for removing the Wikipedia page text after full stop
+def extract_text(after_word_string, text):
+    # Find the index of "je"
+    start_index = text.find(after_word_string)
+
+    if start_index != -1:
+        # Add the length of "je" to get the starting point after "je"
+        start_index += len(after_word_string)
+
+        # Find the index of the first full stop after "je"
+        end_index = text.find(".", start_index)
+
+        #if end_index != -1:
+            # Extract the substring
+        extracted_text = text[start_index:].strip()
+        if extracted_text.endswith("."):
+            extracted_text = extracted_text[:-1]
+        print(extracted_text)
+        return extracted_text
+    #else:
+            #print(f"No full stop found after '{after_word_string}'.")
+            #return "Error"
+    else:
+        print(f"'{after_word_string}' not found in the text.")
+        return "Error"
+
+
+# English words after which the description starts and their codes in the parser translations table
+# (in the order in which they are tried)
+DESCRIPTION_COPULAS = [(" is ", "is"), (" was ", "was_male"), (" was ", "was_female"), (" was ", "was_neutrum"),
+                       (" are ", "are"), (" were ", "were")]
+
+
+# Function for suggesting a description from the plain text of the introduction of a Wikipedia article
+def suggest_description(text: str, copulas: list) -> str:
+    # Selects only the first 400 characters
+    text = text[:400]
+    sentences = regex.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=[.!?])\s+(?=[A-Z])', text)
+    text = sentences[0]
+
+    # Take the text after the first copula found in the first sentence, or the whole sentence if there is none
+    extracted_text = text
+    for copula in copulas:
+        extracted_from_copula = extract_text(copula, text)
+        if extracted_from_copula != "Error":
+            extracted_text = extracted_from_copula
+            break
+
+    print(extracted_text)
+    return extracted_text
+
+
+# Version of the description extraction, increase it whenever suggest_description or extract_text start to give
+# different suggestions, so that suggestions stored by older versions are not used
+EXTRACTOR_VERSION = 1
+
+
+# Sources of the text of the introductions: plain text from the TextExtracts API or wikitext from a pages-articles dump
+EXTRACTS_SOURCE = "extracts"
+XML_DUMP_SOURCE = "xml"
+
+
+# Function to get the version of the description extraction for the given copulas and source of the introductions,
+# it changes whenever EXTRACTOR_VERSION or the copulas change
+def extractor_version(copulas: list, source: str) -> str:
+    return f"{EXTRACTOR_VERSION}-" + hashlib.sha1("|".join(copulas).encode()).hexdigest()[:16] + f":{source}"
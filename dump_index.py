@@ -0,0 +1,188 @@
+# For storing the index in memory-mapped arrays
+import numpy as np
+# For storing the index entries while the dump is read
+from array import array
+# For hashing the titles
+import hashlib
+# For describing the built index
+import json
+import os
+import pathlib
+import shutil
+import time
+# For reading the dump in several processes
+import functools
+# For running the build from the command line
+import sys
+
+# For reading the lines of the dump in several processes at the same time
+from wikidata_dump import map_dump_batches
+# For storing the index next to the other caches
+from wikidata_cache import CACHE_PATH
+# For getting the database names of the projects and comparing titles the same way as the API
+from wikimedia_api import lang_to_dbname, normalize_title
+
+# Directory of the indexes, with one subdirectory per wiki (e.g. .cache/dump_index/skwiki). The subdirectory of a wiki
+# has the manifest of its current index and one subdirectory per build with the arrays of that build.
+INDEX_DIRECTORY = CACHE_PATH.parent / "dump_index"
+
+
+# Function to get the 64-bit hash of a page title under which it is stored in the index
+def title_hash(title: str) -> int:
+    return int.from_bytes(hashlib.blake2b(normalize_title(title).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+# Function to find the sitelinks to the given wikis and the descriptions in the given languages in a batch of lines
+# of the dump, runs in other processes.
+# Returns a dictionary {database name: [(title hash, numeric QID, bit mask of the languages with a description)]}
+def index_lines(lines: list, dbnames: list, languages: list) -> dict:
+    markers = [f'"{dbname}"'.encode("utf-8") for dbname in dbnames]
+    found = {dbname: [] for dbname in dbnames}
+    for line in lines:
+        if not any(marker in line for marker in markers):
+            continue
+        try:
+            entity = json.loads(line.strip().rstrip(b","))
+        except ValueError:
+            continue
+        descriptions = entity.get("descriptions", {})
+        mask = sum(1 << bit for bit, lang in enumerate(languages) if lang in descriptions)
+        for dbname in dbnames:
+            sitelink = entity.get("sitelinks", {}).get(dbname)
+            if sitelink is not None:
+                found[dbname].append((title_hash(sitelink["title"]), int(entity["id"][1:]), mask))
+    return found
+
+
+# Function to get what identifies the dump file, an index built from the same file does not have to be built again
+def dump_identity(path: str) -> dict:
+    stat = os.stat(path)
+    return {"path": str(pathlib.Path(path).resolve()), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+# Function to read the description of the index of a wiki (None if it was not built yet)
+def read_manifest(dbname: str, directory: pathlib.Path = INDEX_DIRECTORY):
+    manifest_path = directory / dbname / "manifest.json"
+    if not manifest_path.is_file():
+        return None
+    return json.loads(manifest_path.read_text(encoding="utf-8"))
+
+
+# Function to build the indexes of the Wikipedias in the given languages from a Wikidata JSON dump.
+# Every index maps the sitelink titles on its wiki to QIDs and has one "has description" bitset per language.
+# Only the indexes which were not built from the same dump file with all the languages yet are built
+# (all of them with one pass over the dump). Returns the manifests of the indexes of all the wikis.
+def build_indexes(dump_path: str, wiki_langs: list, languages: list = None, directory: pathlib.Path = INDEX_DIRECTORY,
+                  processes: int = None) -> dict:
+    languages = languages or wiki_langs
+    identity = dump_identity(dump_path)
+    manifests = {lang_to_dbname(lang): read_manifest(lang_to_dbname(lang), directory) for lang in wiki_langs}
+    outdated = [dbname for dbname, manifest in manifests.items()
+                if manifest is None or manifest["dump"] != identity or not set(languages) <= set(manifest["languages"])]
+    if not outdated:
+        return manifests
+
+    start = time.perf_counter()
+    entries = {dbname: (array("Q"), array("Q"), array("Q")) for dbname in outdated}
+    index_batch = functools.partial(index_lines, dbnames=outdated, languages=languages)
+    for found in map_dump_batches(dump_path, index_batch, processes):
+        for dbname, rows in found.items():
+            hashes, qids, masks = entries[dbname]
+            for row_hash, qid, mask in rows:
+                hashes.append(row_hash)
+                qids.append(qid)
+                masks.append(mask)
+
+    # Every build is written to a new directory, the files of the index which is used (and memory-mapped by a running
+    # app) are never changed
+    build = f"build-{time.time_ns()}"
+    for dbname in outdated:
+        hashes, qids, masks = (np.frombuffer(column, dtype=np.uint64) for column in entries.pop(dbname))
+        # The entries are sorted by the title hash, so that a title is found with a binary search
+        order = np.argsort(hashes, kind="stable")
+        build_directory = directory / dbname / build
+        build_directory.mkdir(parents=True)
+        np.save(build_directory / "hashes.npy", hashes[order])
+        np.save(build_directory / "qids.npy", qids[order])
+        for bit, lang in enumerate(languages):
+            has_description = ((masks[order] >> np.uint64(bit)) & np.uint64(1)).astype(bool)
+            np.save(build_directory / f"descriptions_{lang}.npy", np.packbits(has_description))
+    build_seconds = round(time.perf_counter() - start, 3)
+
+    for dbname in outdated:
+        wiki_directory = directory / dbname
+        manifests[dbname] = {
+            "dump": identity,
+            "languages": list(languages),
+            "build": build,
+            "items": int(np.load(wiki_directory / build / "qids.npy", mmap_mode="r").shape[0]),
+            "build_seconds": build_seconds,
+            "bytes": sum(file.stat().st_size for file in (wiki_directory / build).glob("*.npy")),
+            "built_at": time.time(),
+        }
+        # The manifest is written last and replaces the previous one at once, so the app switches to the new build
+        # only when it was written completely
+        temporary_path = wiki_directory / "manifest.json.tmp"
+        temporary_path.write_text(json.dumps(manifests[dbname]), encoding="utf-8")
+        os.replace(temporary_path, wiki_directory / "manifest.json")
+        # The files of the older builds stay readable for the app which still has them memory-mapped
+        # until it opens the new build
+        for old_build_directory in wiki_directory.glob("build-*"):
+            if old_build_directory.name != build:
+                shutil.rmtree(old_build_directory, ignore_errors=True)
+    return manifests
+
+
+# Index of one wiki built from a Wikidata dump, the arrays are memory-mapped and only the pages of them
+# which are needed are read from the disk
+class DumpIndex:
+    def __init__(self, dbname: str, directory: pathlib.Path = INDEX_DIRECTORY):
+        self.manifest = read_manifest(dbname, directory)
+        build_directory = directory / dbname / self.manifest["build"]
+        self.hashes = np.load(build_directory / "hashes.npy", mmap_mode="r")
+        self.qids = np.load(build_directory / "qids.npy", mmap_mode="r")
+        self.descriptions = {lang: np.load(build_directory / f"descriptions_{lang}.npy", mmap_mode="r")
+                             for lang in self.manifest["languages"]}
+
+    # Function to find the position of a title in the index (None if the title is not in the index)
+    def _position(self, title: str):
+        key = np.uint64(title_hash(title))
+        position = int(np.searchsorted(self.hashes, key))
+        if position < len(self.hashes) and self.hashes[position] == key:
+            return position
+        return None
+
+    # Function to get the QID of the item of a page (None if the page is not in the index)
+    def qid(self, title: str):
+        position = self._position(title)
+        return None if position is None else f"Q{self.qids[position]}"
+
+    # Function to check whether the item of a page had a description in the language when the dump was made
+    # (None if the page or the language is not in the index)
+    def has_description(self, title: str, lang: str):
+        position = self._position(title)
+        if position is None or lang not in self.descriptions:
+            return None
+        return bool(self.descriptions[lang][position >> 3] & (0x80 >> (position & 7)))
+
+
+# Indexes opened by the sessions of all users with the builds they were opened from, None for wikis without an index
+opened_indexes = {}
+
+
+# Function to get the index of the Wikipedia in the given language (None if no index was built for it).
+# The index is opened again when it was built again since it was opened.
+def get_dump_index(lang: str):
+    dbname = lang_to_dbname(lang)
+    manifest = read_manifest(dbname)
+    build = manifest["build"] if manifest is not None else None
+    if dbname not in opened_indexes or opened_indexes[dbname][0] != build:
+        opened_indexes[dbname] = (build, DumpIndex(dbname) if manifest is not None else None)
+    return opened_indexes[dbname][1]
+
+
+# Builds the indexes of the Wikipedias in the given languages: python dump_index.py dump_file lang [lang ...]
+if __name__ == "__main__":
+    for dbname, manifest in build_indexes(sys.argv[1], sys.argv[2:]).items():
+        print(f"{dbname}: {manifest['items']} items, {manifest['bytes'] / 1024 / 1024:.1f} MiB, "
+              f"built in {manifest['build_seconds']} s")
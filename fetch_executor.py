@@ -0,0 +1,77 @@
+# For running the requests in several threads at the same time
+from concurrent.futures import ThreadPoolExecutor, wait
+# For keeping the requests which are still running in the order in which they were started
+from collections import deque
+import itertools
+import threading
+# For running the calls with the context of the calling thread (e.g. the statistics of the current run)
+import contextvars
+
+# Number of threads which send requests at the same time when generating the table
+FETCH_WORKERS = 6
+
+
+# Runs a function (usually one which sends requests to the Wikipedia or Wikidata API) for many values at the same time
+# in a pool of threads and gives back the results in the same order as the values.
+# The number of requests sent to one server at the same time is limited in wikimedia_api.api_get.
+class FetchExecutor:
+    def __init__(self, max_workers: int = FETCH_WORKERS):
+        self.max_workers = max_workers
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self.completed_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def shutdown(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+    # Function to run the function for every value and yield the results in the order of the values.
+    # At most ahead (by default 2 * max_workers) calls are started before the result which is yielded next is used,
+    # so values are taken from the iterable lazily, and if limit is given, the function is called for at most
+    # limit values. on_progress(completed) is called in the calling thread whenever more calls of this imap finished.
+    def imap(self, function, values, on_progress=None, limit: int = None, ahead: int = None):
+        ahead = ahead or 2 * self.max_workers
+        pending = deque()
+        values = iter(values) if limit is None else itertools.islice(values, limit)
+        # Number of finished calls of this imap, updated from the threads of the pool
+        completed = [0]
+        reported = 0
+
+        def count_completed(future):
+            with self.completed_lock:
+                completed[0] += 1
+
+        try:
+            while True:
+                # Start calls until enough of them are running
+                while len(pending) < ahead:
+                    value = next(values, StopIteration)
+                    if value is StopIteration:
+                        break
+                    future = self.pool.submit(contextvars.copy_context().run, function, value)
+                    future.add_done_callback(count_completed)
+                    pending.append(future)
+                if not pending:
+                    return
+                # Wait for the oldest call while reporting the progress of all calls
+                while not pending[0].done():
+                    wait([pending[0]], timeout=0.2)
+                    if on_progress is not None and completed[0] != reported:
+                        reported = completed[0]
+                        on_progress(reported)
+                if on_progress is not None and completed[0] != reported:
+                    reported = completed[0]
+                    on_progress(reported)
+                yield pending.popleft().result()
+        finally:
+            # If the results are not needed anymore (e.g. the table is full), do not start the calls which wait
+            for future in pending:
+                future.cancel()
+
+    # Function to run the function for every value and return the list of results in the order of the values
+    def map(self, function, values, on_progress=None) -> list:
+        return list(self.imap(function, values, on_progress))
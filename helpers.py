@@ -1,16 +1,42 @@
-# For working with Wikipedia and Wikidata
-import pywikibot
-# For cleaning the wikitext from Wikipedia pages
-import wikitextparser
 # For working with tables
 import pandas as pd
 # For working with the GUI
 import streamlit as st
 # For styling components for them to look like Codex (Wikimedia UI)
 from streamlit_extras.stylable_container import stylable_container
-# For finding the end of a sentence
-import regex
 import re
+# For chaining the stages of the table generation
+import itertools
+# For getting data of many pages with one request
+from wikimedia_api import API_BATCH_SIZE, EXTRACTS_BATCH_SIZE, get_lead_texts, get_main_page_title, get_page_revisions, lang_to_dbname, normalize_title, collect_api_statistics, resolve_titles, wikipedia_page_url
+# For reading the uploaded tables
+from csv_ingestion import count_rows, iterate_csv_rows
+# For ranking the pages of a pageview dump file
+from pageview_dump import top_viewed_pages
+# For finding the items without a description in a Wikidata dump file
+from wikidata_dump import MAX_APP_PROCESSES, get_app_process_pool, scan_wikidata_dump
+# For leaving out the pages which had a description in the local dump index
+from dump_index import get_dump_index
+# For listing the pages of a category tree
+from category_traversal import MemberStore, traverse_category
+# For reporting the memory used by the session
+import sys
+# For reusing the Wikidata items downloaded in previous runs
+from wikidata_cache import collect_cache_statistics, get_wikidata_cache
+# For reusing the descriptions suggested for unchanged articles in previous runs
+from suggestion_cache import get_suggestion_cache
+# For sending the requests for many pages at the same time
+from fetch_executor import FetchExecutor
+# For collecting the rows of the table
+from table_builder import TableBuilder
+# For suggesting the descriptions from the introductions of the articles
+from description_extraction import DESCRIPTION_COPULAS, EXTRACTS_SOURCE, XML_DUMP_SOURCE, extractor_version, \
+    suggest_description
+# For sharing the sites between users and publishing as the user of the session
+from site_registry import get_description_editor, get_user_credentials
+# For publishing the descriptions in the background
+from publish_jobs import CANCELLED, COMPLETED, PAUSED, RUNNING, STOPPED, find_active_job, get_publish_job, start_publish_job, \
+    find_interrupted_journals, resume_journal_job, check_publishing_rows
 
 def language_to_lang_code(current_language: str) -> str:
     #language_map = {
@@ -84,11 +110,6 @@ def change_page_to(**kwargs):
         else:
             st.session_state[key] = value
 
-# Function to stop the loop which publishes the descriptions
-def stop_adding_descriptions():
-    st.session_state["stop_adding_descriptions"] = True
-
-
 # Function to change number of seconds remaining to minutes and seconds
 def seconds_to_minutes_and_seconds(total_seconds):
     # get number of minutes and seconds remaining with the highest possible seconds being 50
@@ -103,414 +124,601 @@ def seconds_to_minutes_and_seconds(total_seconds):
         return _("Publishing descriptions. {seconds} seconds remaining.", "publishing_remaining_time_0min", seconds=seconds)
 
 
-# Function for removing the Wikipedia page text after full stop
-def extract_text(after_word_string, text):
-    # Find the index of "je"
-    start_index = text.find(after_word_string)
-
-    if start_index != -1:
-        # Add the length of "je" to get the starting point after "je"
-        start_index += len(after_word_string)
-
-        # Find the index of the first full stop after "je"
-        end_index = text.find(".", start_index)
-
-        #if end_index != -1:
-            # Extract the substring
-        extracted_text = text[start_index:].strip()
-        if extracted_text[-1] == ".":
-            extracted_text = extracted_text[:-1]
-        print(extracted_text)
-        return extracted_text
-    #else:
-            #print(f"No full stop found after '{after_word_string}'.")
-            #return "Error"
-    else:
-        print(f"'{after_word_string}' not found in the text.")
-        return "Error"
+# Function to get the label of the publishing status box: the remaining time estimated from the measured speed
+# of the edits and the number of edits per minute
+def publishing_status_label(eta_seconds: int, edits_per_minute: float) -> str:
+    return (seconds_to_minutes_and_seconds(eta_seconds) + " " +
+            _("({edits_per_minute} edits per minute)", "publishing_edits_per_minute",
+              edits_per_minute=f"{edits_per_minute:.1f}"))
+
+
+# Function to get the words after which the description starts in the current project language
+# (in the order in which they are tried)
+def description_copulas() -> list:
+    return [__(en_text, code) for en_text, code in DESCRIPTION_COPULAS]
+
+
+# Function for generating descriptions from many Wikipedia articles, downloading only the introductions
+# of the articles, 20 articles per request
+# Suggestions for article revisions which were already processed are taken from the suggestion cache
+# The language, copulas and headers are read from the session state unless given, they have to be given
+# when the function runs outside the Streamlit script thread (e.g. in FetchExecutor)
+def generate_descriptions(page_names: list, lang: str = None, copulas: list = None, headers: dict = None) -> dict:
+    if lang is None:
+        lang = __("en", "lang")
+    if copulas is None:
+        copulas = description_copulas()
+    if headers is None:
+        headers = st.session_state["headers"]
+    wiki = lang_to_dbname(lang)
+    version = extractor_version(copulas, EXTRACTS_SOURCE)
+    suggestion_cache = get_suggestion_cache()
+
+    # Find the suggestions for the current revisions of the articles made in previous runs
+    # (the ones made from the introductions downloaded from the API, or else the ones precomputed from a dump)
+    suggestions = suggestion_cache.get(wiki, get_page_revisions(page_names, lang, headers),
+                                       [version, extractor_version(copulas, XML_DUMP_SOURCE)])
+
+    # Download the introductions of the other articles and suggest their descriptions
+    page_names_to_process = [page_name for page_name in page_names if page_name not in suggestions]
+    lead_texts = get_lead_texts(page_names_to_process, lang, headers) if page_names_to_process else {}
+    new_entries = []
+    for page_name in page_names_to_process:
+        suggestions[page_name] = suggest_description(lead_texts[page_name]["text"], copulas)
+        if lead_texts[page_name]["lastrevid"]:
+            new_entries.append((lead_texts[page_name]["pageid"], lead_texts[page_name]["lastrevid"], suggestions[page_name]))
+    suggestion_cache.put(wiki, new_entries, version)
+
+    return {page_name: suggestions[page_name] for page_name in page_names}
 
 
 # Function for generating descriptions from Wikipedia article
-def generate_description(page_name: str) -> str:
-    # Defines site to get texts from
-    site = pywikibot.Site(__("en", "lang"), "wikipedia")
-    # Get the page based on its name
-    page = pywikibot.Page(site, page_name)
-    # Get page's text
-    text = page.text
-
-    # Get the clean text, strips the wikitext away
-    text = wikitextparser.parse(text).sections[0].plain_text()
-    # Selects only the first 400 characters
-    text = text[:400]
-    sentences = regex.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=[.!?])\s+(?=[A-Z])', text)
-    text = sentences[0]
-
-    extracted_text = extract_text(__(" is ", "is"), text)
-    if extracted_text == "Error":
-        extracted_text = extract_text(__(" was ", "was_male"), text)
-        if extracted_text == "Error":
-            extracted_text = extract_text(__(" was ", "was_female"), text)
-            if extracted_text == "Error":
-                extracted_text = extract_text(__(" was ", "was_neutrum"), text)
-                if extracted_text == "Error":
-                    extracted_text = extract_text(__(" are ", "are"), text)
-                    if extracted_text == "Error":
-                        extracted_text = extract_text(__(" were ", "were"), text)
-                        if extracted_text == "Error":
-                            extracted_text = text
-
-    print(extracted_text)
-    return extracted_text
-
-
-# Function for generating the table with Wikipedia articles, links to them, their Wikidata entities,
-# and suggested or user-inputted description
-def generate_table(input: list, type_of_input: str):
-    # Work with sk wikipedia
-    site = pywikibot.Site(__("en", "lang"), "wikipedia")
-
+def generate_description(page_name: str, lang: str = None, copulas: list = None, headers: dict = None) -> str:
+    return generate_descriptions([page_name], lang, copulas, headers)[page_name]
+
+
+# Function to show the warning that a page does not have a Wikidata item
+def warn_page_without_wikidata_object(i: int, page_title: str, page_URL: str):
+    # Container to make the error message look according to Codex (Wikimedia UI)
+    with stylable_container(key=f"warning_{i}",
+                            css_styles="""
+                                                            /* Outer container for st.warning() */
+                                                            div[data-testid="stAlertContainer"] {
+                                                                background-color: #fdf2d5 !important;
+                                                                border: 1px solid #b7985d !important;
+                                                                border-radius: 2px !important;
+                                                                padding: 16px !important;
+                                                                color: #202122 !important;
+                                                                font-family: "Segoe UI", "Helvetica Neue", sans-serif !important;
+                                                                box-shadow: none !important;
+                                                                margin: 1em 0 !important;
+                                                            }
+
+                                                            /* Internal layout: icon + message text */
+                                                            div[data-testid="stAlertContainer"] > div {
+                                                                display: flex !important;
+                                                                align-items: center !important;
+                                                                gap: 12px !important;
+                                                                padding-left: 10px !important;  /* ← Move text to right */
+                                                            }
+
+                                                            /* Hide default SVG icon */
+                                                            div[data-testid="stAlertContainer"] svg {
+                                                                display: none !important;
+                                                            }
+
+                                                            /* Custom Codex success icon with colored circle behind */
+                                                            div[data-testid="stAlertContainer"]::before {
+                                                                content: "";
+                                                                width: 28px;
+                                                                height: 28px;
+                                                                display: inline-block;
+                                                                flex-shrink: 0;
+                                                                background-image: url("https://upload.wikimedia.org/wikipedia/commons/thumb/9/99/OOjs_UI_icon_alert-yellow.svg/240px-OOjs_UI_icon_alert-yellow.svg.png");
+                                                                background-repeat: no-repeat;
+                                                                background-position: center;
+                                                                background-size: 26px 26px;
+                                                            }
+                                    """
+                            ):
+        st.warning(_("The page **{page_title}** ({page_URL}) does not have a Wikidata entry. It will not be included in the table.",
+          "page_without_wikidata_object", page_title=page_title, page_URL=page_URL), width="stretch")
+
+
+# The table is generated by a chain of generators: pages -> Wikidata items -> pages without description ->
+# suggested descriptions -> rows. Every stage asks the previous one for the next value only when it needs it,
+# so once the table has enough rows, no more pages are looked up and no more descriptions are suggested.
+
+# Function to get the pages (with the description set by the user in a file, if any, and the QID of the page,
+# if it is already known) for the table
+def iterate_pages(input, type_of_input: str, progress: dict, executor: FetchExecutor):
     # For file with descriptions input
     if type_of_input == "file_with_descriptions":
-        # Get dataframe from csv file
-        file_df = pd.read_csv(input)
-        # Get a list of article names in a list
-        print(file_df.columns)
-        article_list = file_df["Page"].tolist()
-        # Get a list of descriptions in a list
-        st.session_state["descriptions_list"] = file_df["Description"].tolist()
-
-        # Create a list for Wikipedia Page objects
-        page_list = []
-
-        # For every page from the table
-        for i in range(len(article_list)):
-            # Get the pywikibot Page object of it and add it to the list of all pywikibot page objects
-            page_list.append(pywikibot.Page(site, article_list[i]))
-
+        progress["pages_total"] = count_rows(input)
+        # For every page from the table, get the title of it together with its description,
+        # the file is read in chunks while the pages are needed
+        for article_name, description in iterate_csv_rows(input, ["Page", "Description"],
+                                                           st.session_state["skipped_csv_rows"]):
+            yield normalize_title(article_name), description, None
 
     # For table input
     if type_of_input == "table":
-        # Get dataframe from csv file
-        file_df = pd.read_csv(input)
-        # Get a list of article names in a list
-        article_list = file_df["Page"].tolist()
-
-        # Create a list for Wikipedia Page objects
-        page_list = []
-
-        # For every page from the table
-        for i in range(len(article_list)):
-            # Get the pywikibot Page object of it and add it to the list of all pywikibot page objects
-            page_list.append(pywikibot.Page(site, article_list[i]))
-
-    # If the generation happens for category,
-    # get the list of pages which was already generated when verifying the category
+        progress["pages_total"] = count_rows(input)
+        # For every page from the table, get the title of it
+        for article_name, in iterate_csv_rows(input, ["Page"], st.session_state["skipped_csv_rows"]):
+            yield normalize_title(article_name), None, None
+
+    # For pageview dump input, rank the pages of the project in the dump file
+    if type_of_input == "pageview_dump":
+        pages = top_viewed_pages(input["path"], __("en", "lang"), input["top_n"])
+        progress["pages_total"] = len(pages)
+        for page_title, views in pages:
+            yield normalize_title(page_title), None, None
+
+    # If the generation happens for category, list the pages of the category (and its subcategories) only now,
+    # page by page as they are needed
     if type_of_input == "category" or type_of_input == "category no generation":
-        page_list = input
+        # The number of pages is known in advance only for the category itself, not for its subcategories
+        if st.session_state["category_recurse"] == False:
+            progress["pages_total"] = st.session_state["category_info"]["pages"]
+        max_depth = int(st.session_state["category_recurse"])
+        store = st.session_state.get("category_members")
+        # If all members of the same category were already listed in this session, do not list them again
+        if store is not None and store.matches(input.title(), max_depth) and store.complete:
+            progress["pages_total"] = len(store)
+            members = iter(store)
+        # Otherwise list them and store them for the next time
+        else:
+            store = MemberStore(input.title(), max_depth)
+            st.session_state["category_members"] = store
+            members = store.record(traverse_category(input.title(), __("en", "lang"), st.session_state["headers"],
+                                                     max_depth=max_depth, executor=executor))
+        for member in members:
+            yield member.title, None, member.qid
+
+
+# Function to leave out the pages whose Wikidata item already had a description in the current project lang
+# in the Wikidata dump from which the local index was built, without sending any request.
+# The other pages (without a description or not in the index) are still checked on Wikidata.
+def iterate_prefiltered_pages(pages, lang: str, progress: dict):
+    dump_index = get_dump_index(lang)
+    if dump_index is None:
+        yield from pages
+        return
+    for page_title, user_description, qid in pages:
+        if dump_index.has_description(page_title, lang):
+            progress["pages_prefiltered"] += 1
+            continue
+        yield page_title, user_description, qid
+
+
+# Function to get how many batches of 50 pages should be looked up ahead: if the table has a maximum amount of rows,
+# only about as many batches as the rows need, otherwise as many as the executor allows
+def batches_ahead(max_rows: int, executor: FetchExecutor):
+    if max_rows:
+        return min(-(-max_rows // API_BATCH_SIZE), 2 * executor.max_workers)
+    return None
+
+
+# Function to replace the titles from an uploaded table with the articles they lead to, 50 titles per request.
+# Redirects are followed, titles which are not articles (missing pages, other namespaces, the main page) are left out,
+# and every article is kept only once. The titles which were replaced or left out are saved to show them to the user.
+def iterate_resolved_pages(pages, lang: str, executor: FetchExecutor, max_rows: int = None):
+    headers = st.session_state["headers"]
+    main_page_title = get_main_page_title(lang, headers)
+    collapsed_titles = st.session_state["collapsed_titles"]
+    seen_pageids = set()
+    seen_qids = set()
+
+    # Function to resolve the titles of a batch of pages, runs in the threads of the executor
+    def resolve_batch(batch):
+        return batch, resolve_titles([page_title for page_title, user_description, qid in batch], lang, headers)
+
+    for batch, resolved in executor.imap(resolve_batch, itertools.batched(pages, API_BATCH_SIZE),
+                                         ahead=batches_ahead(max_rows, executor)):
+        for page_title, user_description, qid in batch:
+            page = resolved.get(page_title)
+            if page is None:
+                collapsed_titles.append(_("{title}: page does not exist", "collapsed_missing", title=page_title))
+            elif page["ns"] != 0 or page["title"] == main_page_title:
+                collapsed_titles.append(_("{title}: not an article", "collapsed_not_article", title=page_title))
+            elif page["pageid"] in seen_pageids or (page["qid"] and page["qid"] in seen_qids):
+                collapsed_titles.append(_("{title}: same article as {target}", "collapsed_duplicate",
+                                          title=page_title, target=page["title"]))
+            else:
+                if page["redirect"]:
+                    collapsed_titles.append(_("{title}: redirect to {target}", "collapsed_redirect",
+                                              title=page_title, target=page["title"]))
+                seen_pageids.add(page["pageid"])
+                if page["qid"]:
+                    seen_qids.add(page["qid"])
+                yield page["title"], user_description, page["qid"]
+
+
+# Function to get the Wikidata item and the current project lang description of pages, 50 pages per request
+# (several requests are sent at the same time by the executor)
+def iterate_items(pages, lang: str, progress: dict, executor: FetchExecutor, max_rows: int = None):
+    headers = st.session_state["headers"]
+    wikidata_cache = get_wikidata_cache()
+    # Function to look up the Wikidata items of a batch of pages, runs in the threads of the executor.
+    # The pages come with their QID (or "" if they have no item) from the category listing or the title resolution.
+    def lookup_batch(batch):
+        items_by_qid = wikidata_cache.get_wikidata_items_by_qid([qid for page_title, user_description, qid in batch
+                                                                 if qid], lang, headers)
+        items = {page_title: items_by_qid[qid] for page_title, user_description, qid in batch if qid in items_by_qid}
+        return batch, items
+
+    # Function to show how many pages were already looked up
+    def show_progress(completed_batches):
+        progress["pages_looked_up"] = completed_batches * API_BATCH_SIZE
+        progress["show"]()
+
+    for batch, items in executor.imap(lookup_batch, itertools.batched(pages, API_BATCH_SIZE),
+                                      on_progress=show_progress,
+                                      ahead=batches_ahead(max_rows, executor)):
+        for page_title, user_description, qid in batch:
+            # Get the page URL
+            page_URL = wikipedia_page_url(page_title, lang)
+            # If the Wikipedia page does not have a Wikidata item, show error message
+            if page_title not in items:
+                warn_page_without_wikidata_object(progress["pages_checked"], page_title, page_URL)
+            else:
+                yield {"Page name": page_title, "URL": page_URL,
+                       "Wikidata Object": f"https://www.wikidata.org/wiki/{items[page_title]['qid']}",
+                       "Wikidata description": items[page_title]["description"],
+                       "Wikidata revision": items[page_title]["lastrevid"],
+                       "User description": user_description}
+            progress["pages_checked"] += 1
+
+
+# Function to get the Wikidata items with a sitelink to the project and their current project lang description
+# from a Wikidata JSON dump stored on the server, without sending any request
+def iterate_dump_items(input: dict, lang: str, progress: dict):
+    # The scan uses the pool of processes shared by all users of the app
+    for qid, page_title, description in scan_wikidata_dump(input["path"], lang, MAX_APP_PROCESSES,
+                                                               get_app_process_pool()):
+        yield {"Page name": page_title, "URL": wikipedia_page_url(page_title, lang),
+               "Wikidata Object": f"https://www.wikidata.org/wiki/{qid}",
+               "Wikidata description": description,
+               "Wikidata revision": None,
+               "User description": None}
+        progress["pages_checked"] += 1
+
+
+# Function to add the description to pages: the one set by the user or the one suggested from the Wikipedia article
+def iterate_suggestions(pages, type_of_input: str, progress: dict, executor: FetchExecutor, max_rows: int = None):
+    # If the user already set the description, just use theirs
+    if type_of_input == "category no generation":
+        for page in pages:
+            page["Wikipedia article"] = st.session_state["category_description"]
+            yield page
+    # If the user already set the description in a file, just use theirs
+    elif type_of_input == "file_with_descriptions":
+        for page in pages:
+            page["Wikipedia article"] = page["User description"]
+            yield page
+    # If the user asked for automatic suggested descriptions based on the Wikipedia page
+    else:
+        lang = __("en", "lang")
+        copulas = description_copulas()
+        headers = st.session_state["headers"]
+
+        # Function to get the suggested descriptions for a batch of items from their Wikipedia articles,
+        # runs in the threads of the executor
+        def add_suggestions(batch):
+            suggestions = generate_descriptions([page["Page name"] for page in batch], lang, copulas, headers)
+            for page in batch:
+                page["Wikipedia article"] = suggestions[page["Page name"]]
+            return batch
+
+        # Function to show how many descriptions were already suggested
+        def show_progress(completed_batches):
+            progress["descriptions_suggested"] = completed_batches * EXTRACTS_BATCH_SIZE
+            progress["show"]()
+
+        # Do not download more articles than rows which fit in the table
+        batches = itertools.batched(itertools.islice(pages, max_rows), EXTRACTS_BATCH_SIZE)
+        for batch in executor.imap(add_suggestions, batches, on_progress=show_progress):
+            yield from batch
+
+
+# Function to get the memory used by the largest values in the session state of the current user, in bytes
+def session_memory_report() -> dict:
+    report = {}
+    for key in ("category_members", "table", "list_of_page_names", "list_of_wikidata_objects",
+                "list_of_wikidata_descriptions"):
+        value = st.session_state.get(key)
+        if isinstance(value, MemberStore):
+            report[key] = value.memory_bytes()
+        elif isinstance(value, pd.DataFrame):
+            report[key] = int(value.memory_usage(deep=True).sum())
+        elif isinstance(value, list):
+            report[key] = sys.getsizeof(value) + sum(sys.getsizeof(element) for element in value)
+    return report
 
-    # Define structure for the dataframe
-    df_structure = {
-        "Page name": [],
-        "URL"
-        "Wikidata Object": [],
-        "Wikidata description": []}
-    # Create dataframe that will store the information in a table
-    processed_df = pd.DataFrame(df_structure)
 
-    # Create lists for storing ordered information from the dataframe
-    list_of_page_names = []
-    list_of_URLs = []
-    list_of_wikidata_objects = []
-    list_of_wikidata_descriptions = []
+# Function for generating the table with Wikipedia articles, links to them, their Wikidata entities,
+# and suggested or user-inputted description
+def generate_table(input: list, type_of_input: str):
+    # If the user set the maximum amount of rows in generated table, stop after that many rows
+    if st.session_state["max_rows_in_table_enabled"]:
+        max_rows = st.session_state["max_rows_in_table"]
+    # If the user did not set the maximum amount of rows in generated table,
+    # add every item without current lang description
+    else:
+        max_rows = None
 
+    # Create lists for storing ordered information from the dataframe
     no_desc_list_of_page_names = []
     no_desc_list_of_wikidata_objects = []
     no_desc_list_of_wikidata_descriptions = []
 
-    no_desc_df_structure = {
-        "Page name": [],
-        "Wikidata Object": []}
-
     # Table in which all items without Wikidata descriptions will be stored
-    no_description_df = pd.DataFrame(no_desc_df_structure)
+    no_description_table = TableBuilder()
 
     # Add progress bar for the loading
     progress_bar = st.progress(0, text=_("Getting data and preparing table.", "getting_data_table"))
 
-    # For every item in the uploaded csv file
-    for i in range(len(page_list)):
-        # Show the current table generaton progress with progress bar
-        progress_bar.progress(i/(len(page_list)*2), text=_("Getting data and preparing table.", "getting_data_table"))
-        # Get the page based on the article name
-        page = page_list[i]
-        # Get the page URL
-        page_URL = page.full_url()
-        # Get the Wikidata item of the Wikipedia page
-        try:
-            item = pywikibot.ItemPage.fromPage(page)
-            # Format the Wikidata item into readable format
-            item_name = str(item).replace("[[wikidata:", "")
-            item_name = item_name.replace("]]", "")
-            item_URL = f"https://www.wikidata.org/wiki/{item_name}"
-            item_dict = item.get()
-            # Get the descriptions of the Wikidata item
-            item_descriptions = item_dict["descriptions"]
-            # Check if there is a current project lang description in the Wikidata item
-            if __("en", "lang") in item_descriptions:
-                # Save it
-                description = item_descriptions[__("en", "lang")]
-            # If there is no current project lang description in the Wikidata item
-            else:
-                # Save blank description
-                description = ""
-            # Add article name, URL, Wikidata object and description to the lists
-            list_of_page_names.append(page_list[i].title())
-            list_of_URLs.append(page_URL)
-            list_of_wikidata_objects.append(item_URL)
-            list_of_wikidata_descriptions.append(description)
-
-            # Add article name, URL, Wikidata object and description to the dataframe
-            row = [{"Page name": page_list[i].title(), "URL": page_URL, "Wikidata Object": item,
-                    "Wikidata description": description}]
-            processed_df = pd.concat([processed_df, pd.DataFrame(row)], ignore_index=True)
-        # If the Wikipedia page does not have a Wikidata item, show error message
-        except:
-            # Container to make the error message look according to Codex (Wikimedia UI)
-            with stylable_container(key=f"warning_{i}",
-                                    css_styles="""
-                                                                    /* Outer container for st.warning() */
-                                                                    div[data-testid="stAlertContainer"] {
-                                                                        background-color: #fdf2d5 !important;
-                                                                        border: 1px solid #b7985d !important;
-                                                                        border-radius: 2px !important;
-                                                                        padding: 16px !important;
-                                                                        color: #202122 !important;
-                                                                        font-family: "Segoe UI", "Helvetica Neue", sans-serif !important;
-                                                                        box-shadow: none !important;
-                                                                        margin: 1em 0 !important;
-                                                                    }
-
-                                                                    /* Internal layout: icon + message text */
-                                                                    div[data-testid="stAlertContainer"] > div {
-                                                                        display: flex !important;
-                                                                        align-items: center !important;
-                                                                        gap: 12px !important;
-                                                                        padding-left: 10px !important;  /* ← Move text to right */
-                                                                    }
-
-                                                                    /* Hide default SVG icon */
-                                                                    div[data-testid="stAlertContainer"] svg {
-                                                                        display: none !important;
-                                                                    }
-
-                                                                    /* Custom Codex success icon with colored circle behind */
-                                                                    div[data-testid="stAlertContainer"]::before {
-                                                                        content: "";
-                                                                        width: 28px;
-                                                                        height: 28px;
-                                                                        display: inline-block;
-                                                                        flex-shrink: 0;
-                                                                        background-image: url("https://upload.wikimedia.org/wikipedia/commons/thumb/9/99/OOjs_UI_icon_alert-yellow.svg/240px-OOjs_UI_icon_alert-yellow.svg.png");
-                                                                        background-repeat: no-repeat;
-                                                                        background-position: center;
-                                                                        background-size: 26px 26px;
-                                                                    }
-                                            """
-                                    ):
-                st.warning(_("The page **{page_title}** ({page_URL}) does not have a Wikidata entry. It will not be included in the table.",
-                  "page_without_wikidata_object", page_title=page_list[i].title(), page_URL=page_URL), width="stretch")
-
-    # Set row counter
-    row_number = 1
-    # Get dataframe of only those Wikipedia articles which have no Wikidata description
-    for i in range(len(list_of_page_names)):
-        # If the page has no current lang description
-        if list_of_wikidata_descriptions[i] == "":
-            # Show the progress using progressbar
-            progress_bar.progress(0.5+i / (len(list_of_page_names)*2), text=_("Suggesting descriptions", "suggesting_descriptions"))
-            # If the user already set the description, just use theirs
-            if type_of_input == "category no generation":
-                wikipedia_article = st.session_state["category_description"]
-            # If the user already set the description in a file, just use theirs
-            elif type_of_input == "file_with_descriptions":
-                wikipedia_article = st.session_state["descriptions_list"][i]
-            # If the user asked for automatic suggested descriptions based on the Wikipedia page
-            else:
-                # Get the suggested description for an item from its Wikipedia article
-                wikipedia_article = generate_description(list_of_page_names[i])
-            # Get all the information in a row format
-            row = [{"Page name": list_of_page_names[i], "URL": list_of_URLs[i],
-                    "Wikidata Object": list_of_wikidata_objects[i], "Wikipedia article": wikipedia_article}]
-            # If the user set the maximum amount of rows in generated table
-            if st.session_state["max_rows_in_table_enabled"]:
-                # Check if there is fewer rows in the table right now than the maximum number
-                if st.session_state["max_rows_in_table"] >= row_number:
-                    # Add the row to the dataframe for items without Wikidata description
-                    no_description_df = pd.concat([no_description_df, pd.DataFrame(row)], ignore_index=True)
-                    no_desc_list_of_page_names.append(list_of_page_names[i])
-                    no_desc_list_of_wikidata_objects.append(list_of_wikidata_objects[i])
-                    no_desc_list_of_wikidata_descriptions.append(list_of_wikidata_descriptions[i])
-                    # Increase the row counter by 1
-                    row_number += 1
-            # If the user did not set the maximum amount of rows in generated table,
-            # add every item without current lang description
-            else:
-                # Add the row to the dataframe for items without Wikidata description
-                no_description_df = pd.concat([no_description_df, pd.DataFrame(row)], ignore_index=True)
-                no_desc_list_of_page_names.append(list_of_page_names[i])
-                no_desc_list_of_wikidata_objects.append(list_of_wikidata_objects[i])
-                no_desc_list_of_wikidata_descriptions.append(list_of_wikidata_descriptions[i])
+    # Rows of the uploaded table which could not be read
+    st.session_state["skipped_csv_rows"] = []
+    # Titles of the uploaded table which were replaced with the articles they lead to or left out
+    st.session_state["collapsed_titles"] = []
+
+    # Number of all pages, of pages which were already looked up and checked, and of suggested descriptions,
+    # for showing the progress
+    progress = {"pages_total": None, "pages_looked_up": 0, "pages_checked": 0, "descriptions_suggested": 0,
+                "pages_prefiltered": 0}
+
+    # Function to show the current table generation progress with progress bar, the table is ready either
+    # when it has the maximum amount of rows or when all pages were checked
+    def show_progress():
+        pages_total = max(progress["pages_total"] or 1, 1)
+        progress_value = min(progress["pages_looked_up"], pages_total) / pages_total / 2
+        if max_rows:
+            progress_value = max(progress_value, progress["descriptions_suggested"] / max_rows)
+        else:
+            progress_value += progress["descriptions_suggested"] / pages_total / 2
+        progress_bar.progress(min(progress_value, 1.0), text=_("Getting data and preparing table.", "getting_data_table"))
+    progress["show"] = show_progress
+
+    # Count the data downloaded for this table and the items found in the cache separately from the tables
+    # generated by other users at the same time
+    with collect_api_statistics() as api_statistics, collect_cache_statistics() as cache_statistics, \
+            FetchExecutor() as executor:
+        # Chain the stages of the table generation
+        # The items from a Wikidata dump already have their descriptions
+        if type_of_input == "wikidata_dump":
+            items = iterate_dump_items(input, __("en", "lang"), progress)
+        else:
+            pages = iterate_pages(input, type_of_input, progress, executor)
+            # Titles from an uploaded table can be redirects, duplicates or pages which are not articles
+            if type_of_input in ("table", "file_with_descriptions", "pageview_dump"):
+                pages = iterate_resolved_pages(pages, __("en", "lang"), executor, max_rows)
+            # Pages which already had a description in the Wikidata dump of the local index are not looked up
+            pages = iterate_prefiltered_pages(pages, __("en", "lang"), progress)
+            items = iterate_items(pages, __("en", "lang"), progress, executor, max_rows)
+        # Keep only those Wikipedia articles which have no Wikidata description
+        items_without_description = (item for item in items if item["Wikidata description"] == "")
+        rows = itertools.islice(iterate_suggestions(items_without_description, type_of_input, progress, executor, max_rows), max_rows)
+
+        for row in rows:
+            # Add the row to the dataframe for items without Wikidata description
+            no_description_table.add_row(**row)
+            no_desc_list_of_page_names.append(row["Page name"])
+            no_desc_list_of_wikidata_objects.append(row["Wikidata Object"])
+            no_desc_list_of_wikidata_descriptions.append(row["Wikidata description"])
+
+    print(f"Table generation: {api_statistics['requests']} requests, {api_statistics['bytes']} bytes, "
+          f"{api_statistics['decode_seconds']:.3f} s decoding JSON")
+    print(f"Wikidata cache: {cache_statistics['hits']} hits, {cache_statistics['misses']} misses, "
+          f"{cache_statistics['stale']} stale")
+    print(f"Dump index: {progress['pages_prefiltered']} pages with a description left out")
 
     # Save that the process run and the lists into global variables
     st.session_state["program_run_already"] = True
     st.session_state["list_of_page_names"] = no_desc_list_of_page_names
     st.session_state["list_of_wikidata_objects"] = no_desc_list_of_wikidata_objects
     st.session_state["list_of_wikidata_descriptions"] = no_desc_list_of_wikidata_descriptions
-    st.session_state["table"] = no_description_df
+    st.session_state["table"] = no_description_table.to_dataframe()
+
+    memory_report = session_memory_report()
+    print("Session memory: " + ", ".join(f"{key} {size / 1024:.1f} KiB" for key, size in memory_report.items()))
+
+
+# Function to show the rows of the uploaded table which were left out of the table
+def show_skipped_rows():
+    if len(st.session_state.get("skipped_csv_rows", [])) != 0:
+        with st.expander(_("Rows of the uploaded file which could not be read ({count})", "skipped_csv_rows", count=len(st.session_state["skipped_csv_rows"])), icon=":material/warning:"):
+            for row in st.session_state["skipped_csv_rows"]:
+                st.write(row)
 
 
-# Function for publishing the descriptions as the last step
+# Function to show the titles of the uploaded table which were replaced with the articles they lead to or left out
+def show_collapsed_titles():
+    if len(st.session_state.get("collapsed_titles", [])) != 0:
+        with st.expander(_("Titles of the uploaded file which were merged or left out ({count})", "collapsed_titles", count=len(st.session_state["collapsed_titles"])), icon=":material/merge:"):
+            for collapsed_title in st.session_state["collapsed_titles"]:
+                st.write(collapsed_title)
+
+
+# Function to get the rows of the table with descriptions which are published
+def publishing_rows(publishing_dataframe: pd.DataFrame) -> list:
+    rows = []
+    for index in publishing_dataframe.index:
+        # Get the revision of the item when the table was generated (missing for rows added by the user)
+        if "Wikidata revision" in publishing_dataframe.columns:
+            base_revision = publishing_dataframe["Wikidata revision"].loc[index]
+        else:
+            base_revision = None
+        rows.append({
+            # Get only the Q.... identifier of a Wikidata item
+            "qid": str(publishing_dataframe["Wikidata Object"].loc[index]).split("/")[-1],
+            "description": publishing_dataframe["Wikipedia article"].loc[index],
+            "page_name": str(publishing_dataframe["Page name"].loc[index]),
+            "baserevid": int(base_revision) if pd.notna(base_revision) and base_revision != "" else None,
+        })
+    return rows
+
+
+# Function to show the rows which were not published because their item got a description in the meantime,
+# does not exist anymore or because they do not have an item
+def show_already_described_rows():
+    if len(st.session_state.get("already_described_rows", [])) != 0:
+        with st.expander(_("Rows which were not published ({count})", "already_described_rows", count=len(st.session_state["already_described_rows"])), icon=":material/skip_next:"):
+            for row in st.session_state["already_described_rows"]:
+                if row.get("invalid_qid"):
+                    st.markdown(_("Skipped page **{page_name}**, it does not have a Wikidata item", "row_without_item", page_name=row["page_name"]))
+                elif row["current_description"] is None:
+                    st.markdown(_("Skipped page **{page_name}** (Wikidata item: **{wikidata_item}**), the item does not exist anymore", "deleted_item_row", page_name=row["page_name"], wikidata_item=row["qid"]))
+                else:
+                    st.markdown(_("Skipped page **{page_name}** (Wikidata item: **{wikidata_item}**), it already has the description **{description}**", "already_described_row", page_name=row["page_name"], wikidata_item=row["qid"], description=row["current_description"]))
+
+
+# Function for publishing the descriptions as the last step: the descriptions are published by a background job,
+# which keeps running when the script is run again or the user leaves the page, and the page only shows its progress
 def process_publish_descriptions():
-    # Get table with descriptions for Wikidata items
-    publishing_dataframe = st.session_state["table"]
-    # Define site to publish the descriptions to
-    site = pywikibot.Site("wikidata", "wikidata")
-    # Define the repository of the site
-    repo = site.data_repository()
-
-    # If the process of publishing descriptions has not been stopped
-    if "stop_adding_descriptions" not in st.session_state:
-        # Display button for stopping the process of publishing descriptions
-        #st.button(_("Stop adding descriptions", "stop_publishing_button"), on_click=stop_adding_descriptions, key="button-destructive_1")
-        # Create log for pages which were added
-        st.session_state["added_descriptions_log"] = []
-        # Create log for pages which failed to be added
-        st.session_state["failed_descriptions_log"] = []
-
-    # The process of adding descriptions
+    credentials = get_user_credentials()
+    # The final status of the job of this session is kept in the session, the finished job is removed from the server
+    job_status = st.session_state.get("finished_publish_job_status")
+    job = get_publish_job(st.session_state.get("publish_job_id")) if job_status is None else None
+    # If the user already has a job which did not finish (e.g. started in another tab or before the browser
+    # disconnected), let the user choose whether to show it or to stop it and publish the current table
+    if job_status is None and job is None and find_active_job(credentials["username"]) is not None:
+        st.info(_("Another table of yours is being published. You can show its progress, or stop it and publish the current table.", "publishing_active_job_info"))
+        col1, col2 = st.columns(2)
+        with col1:
+            st.button(_("Show the publishing in progress", "show_active_publishing_button"), on_click=attach_active_job, key="button_show_active_publishing")
+        with col2:
+            st.button(_("Stop it and publish the current table", "stop_active_publishing_button"), on_click=cancel_active_job, key="button_stop_active_publishing")
+        return
+    # If a job of the user was interrupted because the server stopped, let the user choose whether to continue it
+    if job_status is None and job is None and len(find_interrupted_journals(credentials["username"])) != 0:
+        st.info(_("Publishing of your previous table was interrupted. You can continue it where it stopped or publish the current table.", "publishing_interrupted_info"))
+        col1, col2 = st.columns(2)
+        with col1:
+            st.button(_("Continue the interrupted publishing", "resume_interrupted_publishing_button"), on_click=resume_interrupted_job, key="button_resume_interrupted_publishing")
+        with col2:
+            st.button(_("Publish the current table", "publish_current_table_button"), on_click=abandon_interrupted_jobs, key="button_publish_current_table")
+        return
+    # Otherwise start publishing the descriptions of the table as the user of this session
+    if job_status is None and job is None:
+        with st.spinner(_("Checking the current descriptions of the items...", "checking_current_descriptions")):
+            rows, st.session_state["already_described_rows"] = check_publishing_rows(
+                publishing_rows(st.session_state["table"]), __("en", "lang"), st.session_state["headers"])
+        job = get_publish_job(start_publish_job(rows,
+                                                get_description_editor(credentials), __("en", "lang"),
+                                                __("en description sourced from en wiki", "summary"),
+                                                credentials["username"]))
+    if job is not None:
+        st.session_state["publish_job_id"] = job.job_id
+        if job.status()["ended"]:
+            job_status = st.session_state["finished_publish_job_status"] = job.status()
+
+    show_already_described_rows()
+    # The progress of a running job is refreshed every second, the results of a finished job are shown only once
+    if job_status is None:
+        show_publish_job()
+    else:
+        show_publish_job_status(job_status)
+    st.button(_("To homepage", "to_homepage"), on_click=lambda: change_page_to(page="Choose_method", delete="publish_job_id", delete_1="already_described_rows", delete_2="finished_publish_job_status"), key="button_68")
+
+
+# Function to show the job of the user which did not finish in this session
+def attach_active_job():
+    job = find_active_job(get_user_credentials()["username"])
+    if job is not None:
+        st.session_state["publish_job_id"] = job.job_id
+
+
+# Function to stop the job of the user which did not finish, so that the current table is published instead
+def cancel_active_job():
+    job = find_active_job(get_user_credentials()["username"])
+    if job is not None:
+        job.cancel()
+
+
+# Function to continue the interrupted publishing job of the user from its journal
+def resume_interrupted_job():
+    credentials = get_user_credentials()
+    journals = find_interrupted_journals(credentials["username"])
+    # The job could have been resumed in another tab of the user in the meantime
+    if len(journals) == 0:
+        attach_active_job()
+        return
+    st.session_state["publish_job_id"] = resume_journal_job(journals[0], get_description_editor(credentials),
+                                                            st.session_state["headers"])
+    st.session_state["already_described_rows"] = get_publish_job(st.session_state["publish_job_id"]).skipped_rows
+
+
+# Function to give up the interrupted publishing jobs of the user, so that the current table is published instead
+def abandon_interrupted_jobs():
+    for journal in find_interrupted_journals(get_user_credentials()["username"]):
+        journal.close()
+
+
+# Function to pause the publishing job of this session
+def pause_publish_job():
+    get_publish_job(st.session_state["publish_job_id"]).pause()
+
+
+# Function to resume the publishing job of this session
+def resume_publish_job():
+    get_publish_job(st.session_state["publish_job_id"]).resume()
+
+
+# Function to cancel the publishing job of this session
+def cancel_publish_job():
+    get_publish_job(st.session_state["publish_job_id"]).cancel()
+
+
+# Function to show the progress of the publishing job of this session, refreshed every second
+# without running the whole script again until the job ends
+@st.fragment(run_every=1)
+def show_publish_job():
+    job_status = get_publish_job(st.session_state["publish_job_id"]).status()
+    # Run the whole script again, which shows the final status without refreshing it
+    if job_status["ended"]:
+        st.rerun()
+    show_publish_job_status(job_status)
+
+
+# Function to show the status of a publishing job
+def show_publish_job_status(job_status: dict):
     # Show the process in a status box
-    with st.status(_("Publishing descriptions", "publishing_text"), expanded=True, state="running") as status:
-        # For each Wikidata item in the descriptions table
-        for i in range(len(publishing_dataframe)):
-            # If the user requested the stop of the publishing process
-            if "stop_adding_descriptions" in st.session_state:
-                # Skip the items left to be published
-                pass
-            # If the user did not request the stop of the publishing process
-            else:
-                placeholder = st.empty()
-                with placeholder.container():
-                    st.button(_("Stop adding descriptions", "stop_publishing_button"),
-                              on_click=stop_adding_descriptions, key=f"button-destructive_{i}")
-                    # Get the Wikidata item for the item
-                    wikidata_item = str(publishing_dataframe["Wikidata Object"].loc[publishing_dataframe.index[i]])
-                    print(wikidata_item)
-                    # Get the defined description for the Wikidata item
-                    description = publishing_dataframe["Wikipedia article"].loc[publishing_dataframe.index[i]]
-                    # Get the page name on Wikipedia of the Wikidata item
-                    page_name = str(publishing_dataframe["Page name"].loc[publishing_dataframe.index[i]])
-
-                    # Compute how much time is remaining
-                    status_label = seconds_to_minutes_and_seconds((((len(publishing_dataframe))-i) * 10))
-                    # Update the status box
-                    status.update(
-                        label=status_label)
-                    # Get only the Q.... identifier of a Wikidata item
-                    wikidata_item = wikidata_item.split("/")[-1]
-                    # Get the Wikidata item from pywikibot
-                    item = pywikibot.ItemPage(repo, wikidata_item)
-                    # Define the new description in the right format
-                    new_descr = {__("en", "lang"): description}
-                    # Publish the description
-                    try:
-                        item.editDescriptions(new_descr, summary=__("en description sourced from en wiki", "summary"))
-                        print(__("en description sourced from en wiki", "summary"))
-                        #site = pywikibot.Site("en", st.session_state["pywikibot_family"])
-                        #page = pywikibot.Page(site, "Test page 2")
-                        #text = page.text
-                        #text += "\n\nThis is an automated test edit, part 5."
-                        #page.text = text
-                        #page.save(summary="LAST TEST LINE")
-                        # Text informing of the currently published description
-                        st.markdown(
-                            _("Adding description **{description}** for page **{page_name}** (Wikidata item: **{wikidata_item}**)",
-                              "publishing_item", description=description, page_name=page_name,
-                              wikidata_item=wikidata_item))
-                        st.session_state["added_descriptions_log"].append(
-                            _("Added description **{description}** for page **{page_name}** (Wikidata item: **{wikidata_item}**)",
-                              "publishing_item_log", description=description, page_name=page_name,
-                              wikidata_item=wikidata_item))
-                    # If there occurs an error when adding the description with pywikibot
-                    except Exception as e:
-                        # Inform the user and tell them to add the description themselves
-                        with stylable_container(key=f"warning_desc_add_failed_{i}",
-                                                css_styles="""
-                                                                /* Outer container for st.warning() */
-                                                                div[data-testid="stAlertContainer"] {
-                                                                    background-color: #fdf2d5 !important;
-                                                                    border: 1px solid #b7985d !important;
-                                                                    border-radius: 2px !important;
-                                                                    padding: 16px !important;
-                                                                    color: #202122 !important;
-                                                                    font-family: "Segoe UI", "Helvetica Neue", sans-serif !important;
-                                                                    box-shadow: none !important;
-                                                                    margin: 1em 0 !important;
-                                                                }
-        
-                                                                /* Internal layout: icon + message text */
-                                                                div[data-testid="stAlertContainer"] > div {
-                                                                    display: flex !important;
-                                                                    align-items: center !important;
-                                                                    gap: 12px !important;
-                                                                    padding-left: 10px !important;  /* ← Move text to right */
-                                                                }
-        
-                                                                /* Hide default SVG icon */
-                                                                div[data-testid="stAlertContainer"] svg {
-                                                                    display: none !important;
-                                                                }
-        
-                                                                /* Custom Codex success icon with colored circle behind */
-                                                                div[data-testid="stAlertContainer"]::before {
-                                                                    content: "";
-                                                                    width: 28px;
-                                                                    height: 28px;
-                                                                    display: inline-block;
-                                                                    flex-shrink: 0;
-                                                                    background-image: url("https://upload.wikimedia.org/wikipedia/commons/thumb/9/99/OOjs_UI_icon_alert-yellow.svg/240px-OOjs_UI_icon_alert-yellow.svg.png");
-                                                                    background-repeat: no-repeat;
-                                                                    background-position: center;
-                                                                    background-size: 26px 26px;
-                                                                }
-                                        """
-                                                ):
-                            st.warning(_("Failed adding description **{description}** for page **{page_name}** (Wikidata item: **{wikidata_item}**. Add it manually, please.", "publishing_item_failed_warning", description=description, page_name=page_name, wikidata_item=wikidata_item), width="stretch")
-                            st.session_state["failed_descriptions_log"].append(
-                                _("Failed adding description **{description}** for page **{page_name}** (Wikidata item: **{wikidata_item}**. Add it manually, please.", "publishing_item_failed_warning", description=description, page_name=page_name, wikidata_item=wikidata_item))
-                            st.session_state["failed_descriptions_log"].append(str(e))
-                placeholder.empty()
-        # If the descriptions publishing process was stopped
-        if "stop_adding_descriptions" in st.session_state:
-            # Inform the user in the status box
-            status.update(label=_("All descriptions before the interruption were published.", "descriptions_published_stopped"), expanded=True, state="error")
-            # Write all the pages which failed to be published up to the point of stopping the publishing process
-            for i in range(len(st.session_state["failed_descriptions_log"])):
-                st.markdown(st.session_state["failed_descriptions_log"][i])
-            # Write all the pages which were published up to the point of stopping the publishing process
-            for i in range(len(st.session_state["added_descriptions_log"])):
-                st.markdown(st.session_state["added_descriptions_log"][i])
-        # If the descriptions publishing process was completed
-        else:
-            # Inform the user
-            status.update(label=_("All descriptions were published.", "all_descriptions_published"), expanded=True, state="complete")
-            # Write all the pages which failed to be published up to the point of stopping the publishing process
-            for i in range(len(st.session_state["failed_descriptions_log"])):
-                st.markdown(st.session_state["failed_descriptions_log"][i])
-            # Write all the pages which were published up to the point of stopping the publishing prcdess
-            for i in range(len(st.session_state["added_descriptions_log"])):
-                st.markdown(st.session_state["added_descriptions_log"][i])
-    st.button(_("To homepage", "to_homepage"), on_click=lambda: change_page_to(page="Choose_method", delete="stop_adding_descriptions"), key="button_68")
+    if job_status["state"] == COMPLETED:
+        status_label, status_state = _("All descriptions were published.", "all_descriptions_published"), "complete"
+    elif job_status["state"] == CANCELLED:
+        status_label, status_state = _("All descriptions before the interruption were published.", "descriptions_published_stopped"), "error"
+    elif job_status["state"] == STOPPED:
+        status_label, status_state = _("Publishing stopped because its progress could not be saved: {error}", "publishing_stopped_error", error=job_status["error"]), "error"
+    elif job_status["state"] == PAUSED:
+        status_label, status_state = _("Publishing paused.", "publishing_paused"), "running"
+    else:
+        status_label, status_state = publishing_status_label(job_status["eta_seconds"], job_status["edits_per_minute"]), "running"
+
+    with st.status(status_label, expanded=True, state=status_state):
+        st.progress(job_status["done"] / max(job_status["total"], 1),
+                    text=_("{done} of {total} descriptions processed", "publishing_progress",
+                           done=job_status["done"], total=job_status["total"]))
+        # Controls of the job while it runs
+        if job_status["state"] in (RUNNING, PAUSED):
+            col1, col2 = st.columns(2)
+            with col1:
+                if job_status["state"] == RUNNING:
+                    st.button(_("Pause", "pause_publishing_button"), on_click=pause_publish_job, key="button_pause_publishing")
+                else:
+                    st.button(_("Resume", "resume_publishing_button"), on_click=resume_publish_job, key="button_resume_publishing")
+            with col2:
+                st.button(_("Stop adding descriptions", "stop_publishing_button"), on_click=cancel_publish_job,
+                          key="button-destructive_1")
+        # Write all the pages which failed to be published
+        for row in job_status["failed"]:
+            st.markdown(_("Failed adding description **{description}** for page **{page_name}** (Wikidata item: **{wikidata_item}**. Add it manually, please.", "publishing_item_failed_warning", description=row["description"], page_name=row["page_name"], wikidata_item=row["qid"]))
+            st.markdown(row["error"])
+        # Write all the pages which were published
+        for row in job_status["added"]:
+            st.markdown(_("Added description **{description}** for page **{page_name}** (Wikidata item: **{wikidata_item}**)", "publishing_item_log", description=row["description"], page_name=row["page_name"], wikidata_item=row["qid"]))
+
 
 def review_descriptions():
     # List of words to match
@@ -543,11 +751,12 @@ def review_descriptions():
             matched_descriptions_opinionated[str(index)] = row["Wikipedia article"]
 
     for index, row in st.session_state["table"].iterrows():
-        if row["Wikipedia article"][-1] == ".":
+        if row["Wikipedia article"].endswith("."):
             matched_descriptions_full_stop[str(index)] = row["Wikipedia article"]
 
     for index, row in st.session_state["table"].iterrows():
-        if row["Wikipedia article"][0].isupper():
+        # The introduction can be empty (e.g. TextExtracts returned no text), so the description can be empty too
+        if row["Wikipedia article"][:1].isupper():
             if st.session_state["current_language"] == "sk.wikipedia.org" or "en.wikipedia.org":
                 matched_descriptions_capitalized[str(index)] = row["Wikipedia article"]
 
@@ -556,8 +765,8 @@ def review_descriptions():
             matched_descriptions_too_long[str(index)] = row["Wikipedia article"]
 
     for index, row in st.session_state["table"].iterrows():
-        first_word = row["Wikipedia article"].split()[0].lower()
-        if first_word in first_word_list:
+        words = row["Wikipedia article"].split()
+        if len(words) != 0 and words[0].lower() in first_word_list:
             matched_descriptions_first_word[str(index)] = row["Wikipedia article"]
 
 
@@ -28,6 +28,9 @@ from streamlit_local_storage import LocalStorage
 # For creating the project object for pywikibot login
 from pywikibot.family import Family
 
+# For keeping the credentials of every user separate
+from site_registry import set_user_credentials, get_user_credentials, user_write_site
+
 from datetime import datetime, timedelta
 
 
@@ -314,27 +317,14 @@ def login_with_oauth_params_OLD(consumer_key: str, consumer_secret: str, access_
     return family
 
 def login_with_oauth_params(consumer_key: str, consumer_secret: str, access_token: str, access_secret: str, username: str) -> Family:
-    # Set config values in code
-    pywikibot.config.family = "wikidata"
-    pywikibot.config.mylang = "wikidata"
-    pywikibot.config.authenticate = {
-        "www.wikidata.org": (
-            consumer_key,
-            consumer_secret,
-            access_token,
-            access_secret
-        )
-    }
-
-    # Define username for the project
-    pywikibot.config.usernames["wikidata"]["wikidata"] = username
-    site = pywikibot.Site()
+    # Save the credentials only for the session of this user instead of the process-wide pywikibot config,
+    # which is shared by all users of the app
+    set_user_credentials(consumer_key, consumer_secret, access_token, access_secret, username)
 
     # Triggers the OAuth login
-    site.login()
-
-    # Confirm login
-    print("✅ Logged in as:", site.user())
+    with user_write_site(get_user_credentials()) as site:
+        # Confirm login
+        print("✅ Logged in as:", site.user())
 
     #return family
 
@@ -0,0 +1,77 @@
+# For reading compressed dump files
+import gzip
+import bz2
+# For keeping only the most viewed pages
+import heapq
+# For finding the dump files which can be used in the app
+import pathlib
+# For running the ranking from the command line
+import sys
+import csv
+
+# Default number of most viewed pages which are kept
+PAGEVIEW_TOP_N = 1000
+# Directory with the dump files which can be chosen in the app, the app does not open dump files anywhere else
+DUMP_DIRECTORY = pathlib.Path("dumps")
+
+
+# Function to list the names of the dump files which can be chosen in the app
+def list_dump_files(directory: pathlib.Path = DUMP_DIRECTORY) -> list:
+    if not directory.is_dir():
+        return []
+    return sorted(path.name for path in directory.iterdir()
+                  if path.is_file() and path.resolve().is_relative_to(directory.resolve()))
+
+
+# Function to get the path of a dump file chosen in the app, raises ValueError if it is not a file
+# in the dump directory (e.g. a name with ".." or a link leading out of the directory)
+def resolve_dump_file(name: str, directory: pathlib.Path = DUMP_DIRECTORY) -> str:
+    path = (directory / name).resolve()
+    if not path.is_relative_to(directory.resolve()) or not path.is_file():
+        raise ValueError(f"{name} is not a file in {directory}")
+    return str(path)
+
+
+# Function to open a pageview dump file (gzip, bz2 or uncompressed) for reading line by line
+def open_dump(path: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+
+# Function to get the most viewed pages of one project from a pageview dump in the format of the hourly or daily
+# dumps of Wikimedia ("project title count bytes" on every line, e.g. "sk Bratislava 1234 0").
+# The file is read line by line and only the top_n most viewed pages are kept, so the memory does not depend
+# on the size of the file. project is the code of the project in the dump, e.g. "sk" for the desktop site
+# of the Slovak Wikipedia.
+# Returns a list of (page title, number of views), the most viewed page first
+def top_viewed_pages(path: str, project: str, top_n: int = PAGEVIEW_TOP_N) -> list:
+    project = project.encode("utf-8")
+    # Min-heap of (number of views, page title), the least viewed of the kept pages is the first
+    heap = []
+    with open_dump(path) as dump:
+        for line in dump:
+            # Lines of other projects are skipped before they are split
+            if not line.startswith(project + b" "):
+                continue
+            fields = line.split(b" ")
+            if len(fields) < 3 or fields[0] != project or not fields[2].isdigit():
+                continue
+            views = int(fields[2])
+            if len(heap) < top_n:
+                heapq.heappush(heap, (views, fields[1]))
+            elif views > heap[0][0]:
+                heapq.heapreplace(heap, (views, fields[1]))
+    return [(title.decode("utf-8", errors="replace").replace("_", " "), views)
+            for views, title in sorted(heap, reverse=True)]
+
+
+# Writes the most viewed pages as a table in the format of the Page View Tool ("Page" and "Views" columns),
+# which can be uploaded in the Popular mode: python pageview_dump.py dump_file project [top_n]
+if __name__ == "__main__":
+    pages = top_viewed_pages(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else PAGEVIEW_TOP_N)
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["Page", "Views"])
+    writer.writerows(pages)
@@ -0,0 +1,262 @@
+# For running the publishing in the background
+import threading
+import uuid
+import time
+# For recognizing the identifiers of Wikidata items
+import re
+
+# For publishing the descriptions as fast as the servers allow
+from publisher import Publisher
+from description_editor import DescriptionEditor
+# For recording the edits so that the job can be resumed after the server stops
+from publish_journal import PublishJournal, find_unfinished_journals
+# For checking the current descriptions of the items before publishing
+from wikimedia_api import get_wikidata_items_by_qid
+
+
+# States of a publishing job
+RUNNING = "running"
+PAUSED = "paused"
+CANCELLED = "cancelled"
+COMPLETED = "completed"
+# The job stopped because its journal could not be written (e.g. the disk is full)
+STOPPED = "stopped"
+# Identifier of a Wikidata item, rows added by the user in the table have none (e.g. "None" or "nan")
+QID_PATTERN = re.compile(r"Q\d+")
+# Number of seconds for which a finished job is kept, so that the page of the user can still show its results
+FINISHED_JOB_SECONDS = 3600
+
+
+# Job publishing the descriptions of a table in a background thread, so that it keeps running when the script
+# of the app is run again, when the user goes to another page or when the browser disconnects.
+# rows is a list of dictionaries {"qid": ..., "description": ..., "page_name": ..., "baserevid": ...}.
+# The results are kept as data (not as messages) because the interface language is known only in the script thread.
+# Rows which are None are skipped (e.g. the items which got a description before a job was resumed).
+# Every edit is recorded in the journal of the job, and a job resumed from its journal starts at start_row.
+class PublishJob:
+    def __init__(self, rows: list, editor: DescriptionEditor, lang: str, summary: str, username: str,
+                 job_id: str = None, start_row: int = 0):
+        self.job_id = job_id or uuid.uuid4().hex
+        self.start_row = start_row
+        self.rows = rows
+        self.editor = editor
+        self.lang = lang
+        self.summary = summary
+        self.username = username
+        self.publisher = Publisher()
+        self.state = RUNNING
+        self.done = start_row
+        self.journal = None
+        self.added = []
+        self.failed = []
+        # Rows which were left out because their item got a description or was deleted before the job was resumed
+        self.skipped_rows = []
+        self.started_at = time.time()
+        self.finished_at = None
+        # Why the job stopped, if it stopped because of an error
+        self.error = None
+        self.lock = threading.Lock()
+        # Set while the job is not paused
+        self.resumed = threading.Event()
+        self.resumed.set()
+        self.thread = threading.Thread(target=self._run, name=f"publish-{self.job_id}", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def _run(self):
+        try:
+            self._publish_rows()
+        except OSError as exception:
+            # Without the journal the job could not be resumed after a crash, so it does not continue
+            with self.lock:
+                self.state = STOPPED
+                self.error = str(exception)
+        try:
+            self.journal.close()
+        except OSError:
+            pass
+        # Forget the editor (with the OAuth secrets of the user) when the job ends
+        with self.lock:
+            self.editor = None
+            self.finished_at = time.time()
+
+    def _publish_rows(self):
+        for index in range(self.start_row, len(self.rows)):
+            row = self.rows[index]
+            # Wait while the job is paused
+            self.resumed.wait()
+            if self.state == CANCELLED:
+                return
+            if row is None:
+                with self.lock:
+                    self.done += 1
+                continue
+            self.journal.intent(index, row, self.lang)
+            try:
+                result = self.publisher.publish(lambda: self.editor.set_description(
+                    row["qid"], self.lang, row["description"], self.summary, baserevid=row["baserevid"]))
+            except Exception as exception:
+                self.journal.failed(index, row, self.lang, str(exception))
+                with self.lock:
+                    self.failed.append({**row, "error": str(exception)})
+            else:
+                self.journal.done(index, row, self.lang, result.lastrevid)
+                with self.lock:
+                    self.added.append(row)
+            with self.lock:
+                self.done += 1
+        with self.lock:
+            if self.state != CANCELLED:
+                self.state = COMPLETED
+
+    def pause(self):
+        with self.lock:
+            if self.state == RUNNING:
+                self.state = PAUSED
+                self.resumed.clear()
+
+    def resume(self):
+        with self.lock:
+            if self.state == PAUSED:
+                self.state = RUNNING
+                self.resumed.set()
+
+    def cancel(self):
+        with self.lock:
+            if self.state in (RUNNING, PAUSED):
+                self.state = CANCELLED
+                # Let the thread see that the job was cancelled
+                self.resumed.set()
+
+    def is_finished(self) -> bool:
+        return self.state in (CANCELLED, COMPLETED, STOPPED)
+
+    # Function to get the current status of the job for showing it to the user
+    def status(self) -> dict:
+        with self.lock:
+            return {
+                "job_id": self.job_id,
+                "state": self.state,
+                "error": self.error,
+                "total": len(self.rows),
+                "done": self.done,
+                "added": list(self.added),
+                "failed": list(self.failed),
+                "eta_seconds": self.publisher.eta_seconds(len(self.rows) - self.done),
+                "edits_per_minute": self.publisher.edits_per_minute(),
+                # Whether the thread of the job ended, so the status does not change anymore
+                "ended": self.finished_at is not None,
+            }
+
+
+# Function to check the current descriptions of the items right before publishing, because other editors or bots
+# could add them while the table was being edited. Returns (rows which are published, rows which are skipped because
+# their item already has a description in the language or does not exist anymore, e.g. it was deleted or merged),
+# the published rows get the current revision of their item and the skipped rows get the current description
+# of their item (None if the item does not exist anymore).
+# Rows without a valid QID are skipped too (with the "invalid_qid" key) and are not sent to the API, because one
+# malformed id would make the API refuse the whole request.
+def check_publishing_rows(rows: list, lang: str, headers: dict) -> tuple:
+    items = get_wikidata_items_by_qid([row["qid"] for row in rows if QID_PATTERN.fullmatch(row["qid"])], lang, headers)
+    publishing, skipped = [], []
+    for row in rows:
+        item = items.get(row["qid"])
+        if not QID_PATTERN.fullmatch(row["qid"]):
+            skipped.append({**row, "current_description": None, "invalid_qid": True})
+        elif item is None:
+            skipped.append({**row, "current_description": None})
+        elif item["description"] != "":
+            skipped.append({**row, "current_description": item["description"]})
+        else:
+            publishing.append({**row, "baserevid": item["lastrevid"]})
+    return publishing, skipped
+
+
+
+# Status table of the publishing jobs of all users of the app, by job id
+jobs = {}
+jobs_lock = threading.Lock()
+
+
+# Function to remove the jobs which finished more than FINISHED_JOB_SECONDS ago, the jobs lock has to be held
+def remove_finished_jobs():
+    for job_id in [job_id for job_id, job in jobs.items()
+                   if job.finished_at is not None and time.time() - job.finished_at > FINISHED_JOB_SECONDS]:
+        del jobs[job_id]
+
+
+# Function to start publishing the rows in a background job, returns the id of the job
+def start_publish_job(rows: list, editor: DescriptionEditor, lang: str, summary: str, username: str) -> str:
+    job = PublishJob(rows, editor, lang, summary, username)
+    job.journal = PublishJournal.create(job.job_id, username, lang, summary, rows)
+    with jobs_lock:
+        remove_finished_jobs()
+        jobs[job.job_id] = job
+    job.start()
+    return job.job_id
+
+
+# Function to get a publishing job by its id (None if there is no such job)
+def get_publish_job(job_id: str):
+    with jobs_lock:
+        return jobs.get(job_id)
+
+
+# Function to find the job of the user which did not finish yet (e.g. started before the browser disconnected)
+def find_active_job(username: str):
+    with jobs_lock:
+        for job in jobs.values():
+            if job.username == username and not job.is_finished():
+                return job
+    return None
+
+
+# Function to find the journals of the user's jobs which were interrupted because the server stopped
+# (jobs which still run in this server are not interrupted)
+def find_interrupted_journals(username: str) -> list:
+    with jobs_lock:
+        return [journal for journal in find_unfinished_journals(username) if journal.job_id not in jobs]
+
+
+# Function to continue an interrupted job from its journal, returns the id of the job.
+# The rows whose result is in the journal are not published again. If the server stopped during an edit,
+# the current description of that item is checked first and the edit is repeated only if it was not saved.
+# The rows which were not published yet are checked again like before starting a job, and the rows whose item got
+# a description or was deleted in the meantime are skipped.
+# If the job was already resumed (e.g. in another tab of the user), that job is used.
+def resume_journal_job(journal: PublishJournal, editor: DescriptionEditor, headers: dict) -> str:
+    job_description = journal.read_job()
+    rows = job_description["rows"]
+    lang = job_description["lang"]
+    # The job is added to the jobs before anything else, so the journal is not resumed twice at the same time
+    with jobs_lock:
+        if journal.job_id in jobs:
+            return journal.job_id
+        job = PublishJob(rows, editor, lang, job_description["summary"], job_description["username"],
+                         job_id=journal.job_id)
+        job.journal = journal
+        jobs[job.job_id] = job
+    try:
+        next_row, dangling_row = journal.replay()
+        if dangling_row is not None:
+            row = rows[dangling_row]
+            items = get_wikidata_items_by_qid([row["qid"]], lang, headers) if QID_PATTERN.fullmatch(row["qid"]) else {}
+            if row["qid"] in items and items[row["qid"]]["description"] == row["description"]:
+                journal.done(dangling_row, row, lang, items[row["qid"]]["lastrevid"])
+                next_row = dangling_row + 1
+            else:
+                next_row = dangling_row
+        publishing, job.skipped_rows = check_publishing_rows(rows[next_row:], lang, headers)
+    except Exception:
+        # The journal stays interrupted and can be resumed again
+        with jobs_lock:
+            del jobs[job.job_id]
+        raise
+    # The skipped rows are replaced with None, so the other rows keep their positions to which the journal refers
+    skipped_qids = {row["qid"] for row in job.skipped_rows}
+    checked_rows = iter(publishing)
+    job.rows = rows[:next_row] + [None if row["qid"] in skipped_qids else next(checked_rows) for row in rows[next_row:]]
+    job.start_row = job.done = next_row
+    job.start()
+    return job.job_id
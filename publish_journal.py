@@ -0,0 +1,121 @@
+# For writing the journal so that it survives a crash of the server
+import json
+import os
+import pathlib
+import time
+
+# For storing the journals next to the other caches
+from wikidata_cache import CACHE_PATH
+
+# Directory of the journals, with one journal file and one checkpoint file per publishing job
+JOURNAL_DIRECTORY = CACHE_PATH.parent / "publish_journal"
+
+
+# Function to write a whole file so that it has either the old or the new content after a crash
+def write_file_atomically(path: pathlib.Path, text: str):
+    temporary_path = path.with_suffix(path.suffix + ".tmp")
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+# Append-only journal of one publishing job: the first line describes the job (with all its rows), then for every row
+# the intent to edit it is written before the edit and the result (done or failed) after it.
+# The journal exists only while the job is unfinished, it is removed when the job ends.
+# Every line is written to the disk (fsync) before the job continues. The checkpoint file holds the position in the
+# journal after the last result and the number of the next row, so resuming reads only the lines after it.
+class PublishJournal:
+    def __init__(self, job_id: str, directory: pathlib.Path = JOURNAL_DIRECTORY):
+        self.job_id = job_id
+        self.path = directory / f"{job_id}.jsonl"
+        self.checkpoint_path = directory / f"{job_id}.checkpoint.json"
+
+    # Function to create the journal of a new job
+    @classmethod
+    def create(cls, job_id: str, username: str, lang: str, summary: str, rows: list,
+               directory: pathlib.Path = JOURNAL_DIRECTORY):
+        directory.mkdir(parents=True, exist_ok=True)
+        journal = cls(job_id, directory)
+        offset = journal._append({"event": "job", "job_id": job_id, "username": username, "lang": lang,
+                                  "summary": summary, "rows": rows, "created_at": time.time()})
+        journal._write_checkpoint({"username": username, "state": "running", "offset": offset, "next_row": 0})
+        return journal
+
+    # Function to write a line to the end of the journal, returns the position after it
+    def _append(self, record: dict) -> int:
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+            return file.tell()
+
+    def _write_checkpoint(self, checkpoint: dict):
+        write_file_atomically(self.checkpoint_path, json.dumps(checkpoint))
+
+    def read_checkpoint(self) -> dict:
+        return json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+
+    # Function to read the description of the job (the first line of the journal)
+    def read_job(self) -> dict:
+        with open(self.path, encoding="utf-8") as file:
+            return json.loads(file.readline())
+
+    def intent(self, index: int, row: dict, lang: str):
+        self._append({"event": "intent", "index": index, "qid": row["qid"], "lang": lang})
+
+    def done(self, index: int, row: dict, lang: str, lastrevid: int = None):
+        self._result({"event": "done", "index": index, "qid": row["qid"], "lang": lang, "lastrevid": lastrevid})
+
+    def failed(self, index: int, row: dict, lang: str, error: str):
+        self._result({"event": "failed", "index": index, "qid": row["qid"], "lang": lang, "error": error})
+
+    def _result(self, record: dict):
+        offset = self._append(record)
+        checkpoint = self.read_checkpoint()
+        self._write_checkpoint({**checkpoint, "offset": offset, "next_row": record["index"] + 1})
+
+    # Function to remove the journal of a job which finished (completed, cancelled or abandoned by the user), it is not
+    # resumed anymore. The checkpoint is removed first, so a journal without it is never resumed.
+    def close(self):
+        self.checkpoint_path.unlink(missing_ok=True)
+        self.path.unlink(missing_ok=True)
+
+    # Function to find where the job stopped: reads only the lines written after the checkpoint.
+    # Returns (number of the next row, number of the row whose edit was started but whose result was not written,
+    # or None), the edit of such a row may or may not have been saved before the crash
+    def replay(self) -> tuple:
+        checkpoint = self.read_checkpoint()
+        next_row = checkpoint["next_row"]
+        dangling_row = None
+        with open(self.path, "rb+") as file:
+            file.seek(checkpoint["offset"])
+            for line in file:
+                # A line which was not written completely before the crash is removed, so that the next lines are
+                # not appended to it
+                if not line.endswith(b"\n"):
+                    file.truncate(file.tell() - len(line))
+                    break
+                record = json.loads(line)
+                if record["event"] == "intent":
+                    dangling_row = record["index"]
+                elif record["event"] in ("done", "failed"):
+                    next_row = record["index"] + 1
+                    dangling_row = None
+        return next_row, dangling_row
+
+
+# Function to find the journals of the user's jobs which did not finish because the server stopped
+# (only the small checkpoint files are read)
+def find_unfinished_journals(username: str, directory: pathlib.Path = JOURNAL_DIRECTORY) -> list:
+    journals = []
+    for checkpoint_path in directory.glob("*.checkpoint.json"):
+        try:
+            checkpoint = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            # The job finished and its journal was removed in the meantime
+            continue
+        if checkpoint["username"] == username and checkpoint["state"] == "running":
+            journals.append(PublishJournal(checkpoint_path.name.removesuffix(".checkpoint.json"), directory))
+    return journals
@@ -0,0 +1,146 @@
+# For waiting between the edits and measuring their speed
+import time
+import random
+# For using the rate limiter from several threads
+import threading
+# For recognizing lost connections
+import requests
+
+# Number of edits per second at the start of publishing, and the lowest and highest number the rate can change to.
+# The highest rate (30 edits per minute) keeps the edits of a user account without a bot flag within the edit rate
+# expected on Wikidata.
+INITIAL_EDITS_PER_SECOND = 0.2
+MIN_EDITS_PER_SECOND = 0.05
+MAX_EDITS_PER_SECOND = 0.5
+# How many times an edit is tried again after a retryable error, and the first waiting time in seconds
+MAX_EDIT_RETRIES = 5
+BACKOFF_SECONDS = 2.0
+# Weight of the latest edit in the average time between edits
+EWMA_WEIGHT = 0.2
+# Error codes of the API after which the edit can be tried again later
+RETRYABLE_ERROR_CODES = {"maxlag", "ratelimited", "actionthrottledtext", "readonly", "internal_api_error_DBQueryError"}
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+# Token bucket limiting the number of edits per second: tokens are added at the rate up to the capacity
+# and every edit takes one token, waiting until there is one
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def set_rate(self, rate: float):
+        with self.lock:
+            self._refill()
+            self.rate = rate
+
+    # Function to take one token, waiting until there is one
+    def acquire(self):
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) / self.rate
+            time.sleep(wait_seconds)
+
+    # Function to stop giving tokens for the given number of seconds (e.g. when the server asks to wait)
+    def pause(self, seconds: float):
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+# Function to find out whether an edit which failed with the exception can be tried again and after how many seconds
+# the server asked to try it again (None if it did not say)
+def classify_error(exception: Exception) -> tuple:
+    # Errors of the API (pywikibot APIError and the errors of the direct edits have a code)
+    code = getattr(exception, "code", None)
+    if code in RETRYABLE_ERROR_CODES:
+        return True, getattr(exception, "retry_after", None)
+    # HTTP errors
+    response = getattr(exception, "response", None)
+    if response is not None and getattr(response, "status_code", None) in RETRYABLE_STATUS_CODES:
+        try:
+            return True, float(response.headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return True, None
+    # Lost connection or timeout
+    if isinstance(exception, (ConnectionError, TimeoutError, requests.ConnectionError, requests.Timeout)):
+        return True, None
+    return False, None
+
+
+# Publishes edits one after another as fast as the servers allow: the rate of the edits increases slowly while
+# the edits succeed and decreases by half whenever the server is lagged or throttles the edits, and edits which failed
+# with such errors are tried again after an exponentially increasing waiting time.
+# It measures the real speed of the edits to estimate how long the rest of them takes.
+class Publisher:
+    def __init__(self, rate: float = INITIAL_EDITS_PER_SECOND, min_rate: float = MIN_EDITS_PER_SECOND,
+                 max_rate: float = MAX_EDITS_PER_SECOND):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.bucket = TokenBucket(rate)
+        # Average number of seconds between two finished edits, None before the first edit
+        self.seconds_per_edit = None
+        self.last_finished_at = None
+        self.edits = 0
+        self.retries = 0
+
+    def _set_rate(self, rate: float):
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+        self.bucket.set_rate(self.rate)
+
+    def _measure(self):
+        now = time.monotonic()
+        if self.last_finished_at is not None:
+            seconds = now - self.last_finished_at
+            if self.seconds_per_edit is None:
+                self.seconds_per_edit = seconds
+            else:
+                self.seconds_per_edit = EWMA_WEIGHT * seconds + (1 - EWMA_WEIGHT) * self.seconds_per_edit
+        self.last_finished_at = now
+        self.edits += 1
+
+    # Function to run one edit (a function without arguments) when the rate allows it and return its result.
+    # Retryable errors are retried, other errors (and retryable errors after the last retry) are raised.
+    def publish(self, edit):
+        for attempt in range(MAX_EDIT_RETRIES + 1):
+            self.bucket.acquire()
+            try:
+                result = edit()
+            except Exception as exception:
+                retryable, retry_after = classify_error(exception)
+                if not retryable or attempt == MAX_EDIT_RETRIES:
+                    self._measure()
+                    raise
+                self.retries += 1
+                # Slow down and wait as long as the server asked, or exponentially longer after every error
+                self._set_rate(self.rate / 2)
+                wait_seconds = retry_after or BACKOFF_SECONDS * 2 ** attempt * (1 + random.random() / 2)
+                self.bucket.pause(wait_seconds)
+                continue
+            # Speed up slowly while the edits succeed
+            self._set_rate(self.rate + 0.05)
+            self._measure()
+            return result
+
+    # Function to estimate how many seconds the given number of remaining edits takes
+    def eta_seconds(self, remaining: int) -> int:
+        seconds_per_edit = self.seconds_per_edit if self.seconds_per_edit is not None else 1 / self.rate
+        return round(remaining * seconds_per_edit)
+
+    # Function to get the measured number of edits per minute
+    def edits_per_minute(self) -> float:
+        seconds_per_edit = self.seconds_per_edit if self.seconds_per_edit is not None else 1 / self.rate
+        return 60 / seconds_per_edit if seconds_per_edit > 0 else 0.0
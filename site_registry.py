@@ -0,0 +1,80 @@
+# For working with Wikipedia and Wikidata
+import pywikibot
+# For accessing the credentials of the current user
+import streamlit as st
+# For sharing the sites between the sessions of all users
+import threading
+import contextlib
+
+# For publishing the descriptions as the user
+from description_editor import DescriptionEditor
+
+# Server on which the descriptions are published
+WIKIDATA_HOST = "www.wikidata.org"
+
+# Sites used only for reading, shared by the sessions of all users of the app
+read_sites = {}
+read_sites_lock = threading.Lock()
+
+# pywikibot reads the OAuth credentials for every request from the process-wide pywikibot.config.authenticate,
+# so only one user at a time can send authenticated requests. The lock is held while one user's credentials are set.
+write_lock = threading.RLock()
+
+
+# Function to get a site for reading (no login), created only once for all sessions of the app
+def get_read_site(code: str, family: str) -> pywikibot.site.BaseSite:
+    with read_sites_lock:
+        if (code, family) not in read_sites:
+            read_sites[(code, family)] = pywikibot.Site(code, family)
+        return read_sites[(code, family)]
+
+
+# Function to save the OAuth credentials of the user of this session
+def set_user_credentials(consumer_key: str, consumer_secret: str, access_token: str, access_secret: str, username: str):
+    st.session_state["wikidata_credentials"] = {
+        "oauth": (consumer_key, consumer_secret, access_token, access_secret),
+        "username": username,
+    }
+
+
+# Function to get the OAuth credentials of the user of this session
+def get_user_credentials() -> dict:
+    return st.session_state["wikidata_credentials"]
+
+
+# Function to get the editor publishing descriptions as the user with the given credentials,
+# created once per session so that its CSRF token is reused for all edits
+def get_description_editor(credentials: dict) -> DescriptionEditor:
+    editor = st.session_state.get("description_editor")
+    if editor is None or editor.credentials is not credentials:
+        editor = DescriptionEditor(credentials, st.session_state["headers"])
+        st.session_state["description_editor"] = editor
+    return editor
+
+
+# Context manager giving the Wikidata site logged in as the user with the given credentials.
+# Only the requests sent inside the with block are authenticated as this user, and other users wait until it ends,
+# so keep the block short (e.g. one edit).
+@contextlib.contextmanager
+def user_write_site(credentials: dict):
+    with write_lock:
+        previous_authentication = pywikibot.config.authenticate.get(WIKIDATA_HOST)
+        previous_username = pywikibot.config.usernames["wikidata"].get("wikidata")
+        pywikibot.config.authenticate[WIKIDATA_HOST] = credentials["oauth"]
+        pywikibot.config.usernames["wikidata"]["wikidata"] = credentials["username"]
+        try:
+            # pywikibot keeps one site object per user
+            site = pywikibot.Site("wikidata", "wikidata", user=credentials["username"])
+            # Triggers the OAuth login (only the first time for this user)
+            site.login()
+            yield site
+        finally:
+            # Remove the credentials of the user so that no other request is sent with them
+            if previous_authentication is None:
+                pywikibot.config.authenticate.pop(WIKIDATA_HOST, None)
+            else:
+                pywikibot.config.authenticate[WIKIDATA_HOST] = previous_authentication
+            if previous_username is None:
+                pywikibot.config.usernames["wikidata"].pop("wikidata", None)
+            else:
+                pywikibot.config.usernames["wikidata"]["wikidata"] = previous_username
@@ -0,0 +1,89 @@
+# For storing the suggested descriptions in a file
+import sqlite3
+import pathlib
+# For using the cache from several threads
+import threading
+
+# The suggestions are stored in the same file as the cached Wikidata items
+from wikidata_cache import CACHE_PATH
+
+
+# Local cache of suggested descriptions, keyed by (wiki, page id, revision id, extractor version).
+# A suggestion depends only on the text of one revision of the article and on the code and words which extract it,
+# so an article which did not change since the previous run is not downloaded and processed again.
+# The extractor version changes whenever that code or those words change and also says where the text came from
+# (the API or a dump), and suggestions made by other versions are removed the first time the cache is used for a wiki.
+class SuggestionCache:
+    def __init__(self, path: pathlib.Path = CACHE_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        # (wiki, extractor versions) pairs for which the suggestions of other versions were already removed
+        self.cleaned_versions = set()
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS suggestions (
+                    wiki TEXT,
+                    pageid INTEGER,
+                    revid INTEGER,
+                    extractor_version TEXT,
+                    suggestion TEXT,
+                    PRIMARY KEY (wiki, pageid, revid, extractor_version)
+                )
+            """)
+
+    # Function to remove the suggestions of a wiki made by other extractor versions
+    def _remove_old_versions(self, wiki: str, extractor_versions: tuple):
+        if (wiki, extractor_versions) in self.cleaned_versions:
+            return
+        with self.lock, self.connection:
+            self.connection.execute(f"""
+                DELETE FROM suggestions
+                WHERE wiki = ? AND extractor_version NOT IN ({", ".join("?" * len(extractor_versions))})
+            """, (wiki, *extractor_versions))
+            self.cleaned_versions.add((wiki, extractor_versions))
+
+    # Function to get the stored suggestions of page revisions made by one of the given extractor versions
+    # (the first of them which has a suggestion for the revision is used)
+    # revisions is a dictionary {page title: {"pageid": ..., "lastrevid": ...}},
+    # returns a dictionary {page title: suggestion} for the revisions which have a stored suggestion
+    def get(self, wiki: str, revisions: dict, extractor_versions: list) -> dict:
+        extractor_versions = tuple(extractor_versions)
+        self._remove_old_versions(wiki, extractor_versions)
+        suggestions = {}
+        with self.lock:
+            for page_title, revision in revisions.items():
+                for extractor_version in extractor_versions:
+                    row = self.connection.execute("""
+                        SELECT suggestion FROM suggestions
+                        WHERE wiki = ? AND pageid = ? AND revid = ? AND extractor_version = ?
+                    """, (wiki, revision["pageid"], revision["lastrevid"], extractor_version)).fetchone()
+                    if row is not None:
+                        suggestions[page_title] = row[0]
+                        break
+        return suggestions
+
+    # Function to store suggestions, entries is a list of (page id, revision id, suggestion)
+    def put(self, wiki: str, entries: list, extractor_version: str):
+        with self.lock, self.connection:
+            # Older revisions of the same pages will not be asked for again
+            self.connection.executemany("DELETE FROM suggestions WHERE wiki = ? AND pageid = ? AND revid < ?",
+                                        [(wiki, pageid, revid) for pageid, revid, suggestion in entries])
+            self.connection.executemany("INSERT OR REPLACE INTO suggestions VALUES (?, ?, ?, ?, ?)",
+                                        [(wiki, pageid, revid, extractor_version, suggestion)
+                                         for pageid, revid, suggestion in entries])
+
+
+# Cache shared by all sessions of the app, created when it is used for the first time
+suggestion_cache = None
+suggestion_cache_lock = threading.Lock()
+
+
+# Function to get the cache shared by all sessions of the app
+def get_suggestion_cache() -> SuggestionCache:
+    global suggestion_cache
+    with suggestion_cache_lock:
+        if suggestion_cache is None:
+            suggestion_cache = SuggestionCache()
+        return suggestion_cache
@@ -0,0 +1,28 @@
+# For creating the table shown to the user
+import pandas as pd
+
+# Columns of the table with descriptions in the order in which they are stored in st.session_state["table"]
+# ("Wikidata revision" is the revision of the item when the table was generated, it is not shown to the user)
+TABLE_COLUMNS = ["Page name", "Wikidata Object", "URL", "Wikipedia article", "Wikidata revision"]
+
+
+# Collects the rows of a table column by column and creates the dataframe only once all rows are collected.
+# Adding a row to a pandas dataframe copies the whole dataframe, so building a table row by row with pd.concat
+# takes time proportional to the square of the number of rows.
+class TableBuilder:
+    def __init__(self, columns: list = None):
+        # One list of values for every column
+        self.columns = {column: [] for column in (columns or TABLE_COLUMNS)}
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    # Function to add one row, values of columns which are not given are left blank
+    def add_row(self, **values):
+        for column, column_values in self.columns.items():
+            column_values.append(values.get(column, ""))
+
+    # Function to create the dataframe from the collected rows
+    def to_dataframe(self) -> pd.DataFrame:
+        # Keep the text columns as object columns, the same as the tables built with pd.concat
+        return pd.DataFrame({column: pd.Series(values, dtype=object) for column, values in self.columns.items()})
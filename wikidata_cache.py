@@ -0,0 +1,168 @@
+# For storing the cache in a file
+import sqlite3
+import pathlib
+# For storing and expiring the cache entries
+import time
+# For using the cache from several threads
+import threading
+# For collecting the statistics of one run separately from the runs of other users
+import contextvars
+import contextlib
+
+# For downloading the items which are not in the cache
+from wikimedia_api import get_wikidata_items_by_qid, get_lastrevids
+
+# File of the local cache, shared by all users of the app
+CACHE_PATH = pathlib.Path(__file__).parent / ".cache" / "adddesc_cache.sqlite3"
+# How long a cached item can be used (after revalidation) before it is downloaded again, in seconds
+CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+# Maximal number of items in the cache, the least recently used items are removed above it
+CACHE_MAX_ITEMS = 200_000
+
+
+# Local cache of Wikidata items: QID -> latest revision id and descriptions per language.
+# Before a cached item is used, its latest revision id is checked on Wikidata (50 items per request)
+# and only items which changed since they were cached are downloaded again.
+class WikidataCache:
+    def __init__(self, path: pathlib.Path = CACHE_PATH, ttl_seconds: int = CACHE_TTL_SECONDS,
+                 max_items: int = CACHE_MAX_ITEMS):
+        self.ttl_seconds = ttl_seconds
+        self.max_items = max_items
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.stored_since_eviction = 0
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.executescript("""
+                CREATE TABLE IF NOT EXISTS items (
+                    qid TEXT PRIMARY KEY,
+                    lastrevid INTEGER,
+                    fetched_at REAL,
+                    used_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS items_used_at ON items (used_at);
+                CREATE TABLE IF NOT EXISTS descriptions (
+                    qid TEXT,
+                    lang TEXT,
+                    description TEXT,
+                    PRIMARY KEY (qid, lang)
+                );
+                -- The items are looked up only by their QIDs, the sitelinks stored by older versions are not needed
+                DROP TABLE IF EXISTS sitelinks;
+            """)
+
+    # Function to save downloaded items into the cache
+    def _store(self, items: dict, lang: str):
+        if not items:
+            return
+        now = time.time()
+        with self.lock, self.connection:
+            for item in items.values():
+                # Descriptions in other languages belong to an older revision if the item changed since then
+                self.connection.execute("""
+                    DELETE FROM descriptions WHERE qid = ? AND lang != ?
+                        AND qid IN (SELECT qid FROM items WHERE lastrevid != ?)
+                """, (item["qid"], lang, item["lastrevid"]))
+                self.connection.execute("""
+                    INSERT INTO items (qid, lastrevid, fetched_at, used_at) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (qid) DO UPDATE SET lastrevid = excluded.lastrevid,
+                        fetched_at = excluded.fetched_at, used_at = excluded.used_at
+                """, (item["qid"], item["lastrevid"], now, now))
+                self.connection.execute("INSERT OR REPLACE INTO descriptions (qid, lang, description) VALUES (?, ?, ?)",
+                                        (item["qid"], lang, item["description"]))
+            self.stored_since_eviction += len(items)
+        # Removing items goes through whole tables, so do it only after every 1000 stored items
+        if self.stored_since_eviction >= 1000:
+            self._evict()
+
+    # Function to mark items as used now, so that they are removed from the cache last
+    def _touch(self, qids: list):
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.executemany("UPDATE items SET used_at = ? WHERE qid = ?", [(now, qid) for qid in qids])
+
+    # Function to remove expired items and the least recently used items above the maximal number of items
+    def _evict(self):
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM items WHERE fetched_at < ?", (time.time() - self.ttl_seconds,))
+            self.connection.execute("""
+                DELETE FROM items WHERE qid IN (
+                    SELECT qid FROM items ORDER BY used_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_items,))
+            self.connection.execute("DELETE FROM descriptions WHERE qid NOT IN (SELECT qid FROM items)")
+            self.stored_since_eviction = 0
+
+    # Function to get the Wikidata items with known QIDs (same result as wikimedia_api.get_wikidata_items_by_qid),
+    # reading them from the cache if they did not change since they were cached
+    def get_wikidata_items_by_qid(self, qids: list, lang: str, headers: dict) -> dict:
+        oldest_fetched_at = time.time() - self.ttl_seconds
+        cached = {}
+        expired = 0
+        with self.lock:
+            for qid in qids:
+                row = self.connection.execute("""
+                    SELECT items.lastrevid, items.fetched_at, descriptions.description
+                    FROM items
+                    JOIN descriptions ON descriptions.qid = items.qid AND descriptions.lang = ?
+                    WHERE items.qid = ?
+                """, (lang, qid)).fetchone()
+                if row is None:
+                    continue
+                lastrevid, fetched_at, description = row
+                if fetched_at < oldest_fetched_at:
+                    expired += 1
+                    continue
+                cached[qid] = {"qid": qid, "description": description, "lastrevid": lastrevid}
+        # Check which cached items changed since they were cached
+        lastrevids = get_lastrevids(list(cached), headers) if cached else {}
+        items = {qid: item for qid, item in cached.items() if lastrevids.get(qid) == item["lastrevid"]}
+        self._touch(list(items))
+
+        # Download the items which are not in the cache or which changed
+        to_download = [qid for qid in qids if qid not in items]
+        downloaded = get_wikidata_items_by_qid(to_download, lang, headers) if to_download else {}
+        self._store(downloaded, lang)
+        items.update(downloaded)
+
+        hits = len(qids) - len(to_download)
+        stale = len(cached) - hits + expired
+        statistics = current_cache_statistics.get()
+        if statistics is not None:
+            with self.lock:
+                statistics["hits"] += hits
+                statistics["stale"] += stale
+                statistics["misses"] += len(to_download) - stale
+        return items
+
+
+# Numbers of items found in the cache (hits), not found (misses) and found but changed or expired (stale)
+# in the current run of one user (see collect_cache_statistics), None outside of a run
+current_cache_statistics = contextvars.ContextVar("current_cache_statistics", default=None)
+
+
+# Context manager collecting the statistics of the cache inside the with block (the same way as
+# wikimedia_api.collect_api_statistics), gives the dictionary with the statistics
+@contextlib.contextmanager
+def collect_cache_statistics():
+    statistics = {"hits": 0, "misses": 0, "stale": 0}
+    token = current_cache_statistics.set(statistics)
+    try:
+        yield statistics
+    finally:
+        current_cache_statistics.reset(token)
+
+
+# Cache shared by all sessions of the app, created when it is used for the first time
+wikidata_cache = None
+wikidata_cache_lock = threading.Lock()
+
+
+# Function to get the cache shared by all sessions of the app
+def get_wikidata_cache() -> WikidataCache:
+    global wikidata_cache
+    with wikidata_cache_lock:
+        if wikidata_cache is None:
+            wikidata_cache = WikidataCache()
+        return wikidata_cache
@@ -0,0 +1,121 @@
+# For decoding the entities in the dump
+import json
+# For decoding the lines of the dump in several processes at the same time
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+import multiprocessing
+import contextlib
+import threading
+import functools
+import itertools
+import os
+# For running the scan from the command line
+import sys
+import csv
+
+# For opening compressed dump files
+from pageview_dump import open_dump
+# For getting the database name of the project
+from wikimedia_api import lang_to_dbname
+
+# Number of lines of the dump which are sent to a process at once
+DUMP_BATCH_LINES = 2000
+# Highest number of processes scanning dumps for all users of the app together
+MAX_APP_PROCESSES = 2
+
+
+# Function to find the items with a sitelink to the project in a batch of lines of the dump, runs in other processes.
+# Lines without the database name of the project are skipped without decoding them.
+# Returns a list of (QID, sitelink title, description in the language or "")
+def scan_lines(lines: list, dbname: str, lang: str) -> list:
+    marker = f'"{dbname}"'.encode("utf-8")
+    found = []
+    for line in lines:
+        if marker not in line:
+            continue
+        line = line.strip().rstrip(b",")
+        try:
+            entity = json.loads(line)
+        except ValueError:
+            continue
+        sitelink = entity.get("sitelinks", {}).get(dbname)
+        if sitelink is None:
+            continue
+        description = entity.get("descriptions", {}).get(lang)
+        found.append((entity["id"], sitelink["title"], description["value"] if description else ""))
+    return found
+
+
+# Function to create a pool of processes which are not forked from the (possibly multi-threaded) process itself,
+# because forking a process with threads can copy locks held by other threads
+def create_process_pool(processes: int) -> ProcessPoolExecutor:
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context(start_method))
+
+
+# Pool shared by all sessions of the app, so that scans of several users do not use more than MAX_APP_PROCESSES
+# processes together, created when it is used for the first time
+app_process_pool = None
+app_process_pool_lock = threading.Lock()
+
+
+# Function to get the pool shared by all sessions of the app
+def get_app_process_pool() -> ProcessPoolExecutor:
+    global app_process_pool
+    with app_process_pool_lock:
+        if app_process_pool is None:
+            app_process_pool = create_process_pool(min(MAX_APP_PROCESSES, os.cpu_count() or 1))
+        return app_process_pool
+
+
+# Function to run a function for every batch in several processes at the same time and yield the results
+# in the order of the batches. At most 2 batches per process are taken from the iterable ahead,
+# so the memory does not depend on the number of batches.
+# If a pool is given (e.g. the pool of the app), it is used and left running and processes should be its number
+# of processes, otherwise a pool with the given number of processes is created for this run.
+def map_in_processes(function, batches, processes: int = None, pool: ProcessPoolExecutor = None):
+    processes = processes or os.cpu_count() or 1
+    pending = deque()
+    batches = iter(batches)
+    with contextlib.nullcontext(pool) if pool is not None else create_process_pool(processes) as pool:
+        try:
+            while True:
+                # Take more batches until every process has enough of them
+                while len(pending) < 2 * processes:
+                    batch = next(batches, None)
+                    if batch is None:
+                        break
+                    pending.append(pool.submit(function, batch))
+                if not pending:
+                    return
+                yield pending.popleft().result()
+        finally:
+            # If the results are not needed anymore, do not process the batches which were already taken
+            for future in pending:
+                future.cancel()
+
+
+# Function to run a function for every batch of lines of a dump in several processes at the same time
+# and yield the results in the order of the batches
+def map_dump_batches(path: str, function, processes: int = None, pool: ProcessPoolExecutor = None):
+    with open_dump(path) as dump:
+        yield from map_in_processes(function, itertools.batched(dump, DUMP_BATCH_LINES), processes, pool)
+
+
+# Function to go through a Wikidata JSON dump (.json, .json.gz or .json.bz2 with one entity per line)
+# and yield (QID, sitelink title on the Wikipedia in the given language, description in the language or "")
+# for every item with a sitelink to that Wikipedia, in the order of the dump
+def scan_wikidata_dump(path: str, lang: str, processes: int = None, pool: ProcessPoolExecutor = None):
+    scan_batch = functools.partial(scan_lines, dbname=lang_to_dbname(lang), lang=lang)
+    for found in map_dump_batches(path, scan_batch, processes, pool):
+        yield from found
+
+
+# Writes the items with a sitelink to the Wikipedia but without a description in its language as a table
+# which can be uploaded in the Popular mode: python wikidata_dump.py dump_file lang
+if __name__ == "__main__":
+    writer = csv.writer(sys.stdout)
+    writer.writerow(["Page", "Wikidata item"])
+    for qid, title, description in scan_wikidata_dump(sys.argv[1], sys.argv[2]):
+        if description == "":
+            writer.writerow([title, qid])
@@ -0,0 +1,290 @@
+# For sending requests to the Wikipedia and Wikidata APIs
+import requests
+# For measuring how long decoding of the responses takes
+import time
+import json
+# For updating the statistics and limiting the requests to one server from several threads
+import threading
+# For collecting the statistics of one run separately from the runs of other users
+import contextvars
+import contextlib
+# For getting the server from the API URL and building the URLs of pages
+from urllib.parse import urlparse, quote
+
+# Wikidata API endpoint
+WIKIDATA_API_URL = "https://www.wikidata.org/w/api.php"
+
+# Maximal number of titles or ids which the API accepts in one request for normal users
+API_BATCH_SIZE = 50
+# Maximal number of pages for which the API returns the introduction text in one request
+EXTRACTS_BATCH_SIZE = 20
+
+# Maximal number of requests sent to one server (e.g. www.wikidata.org) at the same time
+MAX_REQUESTS_PER_HOST = 4
+# Ask the servers to refuse the request when their database replication lag is higher than this (in seconds),
+# see https://www.mediawiki.org/wiki/Manual:Maxlag_parameter
+MAXLAG = 5
+# How many times to repeat a request which the server asked to repeat later
+MAX_RETRIES = 5
+
+# One HTTP session for all requests so that connections are reused between requests
+session = requests.Session()
+# Connection pools large enough for all threads which send requests at the same time
+session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=20, pool_maxsize=MAX_REQUESTS_PER_HOST * 4))
+
+# Semaphores limiting the number of requests to every server, shared by all users of the app
+host_semaphores = {}
+host_semaphores_lock = threading.Lock()
+
+# Statistics of the API requests sent in the current run of one user (see collect_api_statistics),
+# None outside of a run
+current_api_statistics = contextvars.ContextVar("current_api_statistics", default=None)
+api_statistics_lock = threading.Lock()
+
+
+# Function to get the API endpoint of the Wikipedia in the given language
+def wikipedia_api_url(lang: str) -> str:
+    return f"https://{lang}.wikipedia.org/w/api.php"
+
+
+# Function to get the URL of a page of the Wikipedia in the given language (same URL as pywikibot Page.full_url())
+def wikipedia_page_url(title: str, lang: str) -> str:
+    return f"https://{lang}.wikipedia.org/wiki/{quote(title.replace(' ', '_'), safe='')}"
+
+
+# Function to get the database name of the Wikipedia in the given language (e.g. "en" -> "enwiki"),
+# which Wikidata uses to identify sitelinks
+def lang_to_dbname(lang: str) -> str:
+    return lang.replace("-", "_") + "wiki"
+
+
+# Function to bring a page title to the form in which Wikipedia stores it
+# (spaces instead of underscores and first letter capitalized)
+def normalize_title(title: str) -> str:
+    title = title.replace("_", " ").strip()
+    return title[:1].upper() + title[1:]
+
+
+# Function to split a list into lists of at most batch_size items
+def chunks(items: list, batch_size: int = API_BATCH_SIZE):
+    for start in range(0, len(items), batch_size):
+        yield items[start:start + batch_size]
+
+
+# Context manager collecting the statistics of the API requests sent inside the with block, also by the threads
+# of a FetchExecutor used in it, but not the requests of other users running at the same time.
+# Gives the dictionary with the statistics, which is updated while the requests are sent.
+@contextlib.contextmanager
+def collect_api_statistics():
+    statistics = {"requests": 0, "bytes": 0, "decode_seconds": 0.0}
+    token = current_api_statistics.set(statistics)
+    try:
+        yield statistics
+    finally:
+        current_api_statistics.reset(token)
+
+
+# Function to get the semaphore limiting the number of requests sent to the server of the URL at the same time
+def host_semaphore(url: str) -> threading.BoundedSemaphore:
+    host = urlparse(url).netloc
+    with host_semaphores_lock:
+        if host not in host_semaphores:
+            host_semaphores[host] = threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+        return host_semaphores[host]
+
+
+# Function to get how many seconds the server asked to wait before repeating the request
+def retry_after_seconds(response: requests.Response) -> float:
+    try:
+        return max(float(response.headers.get("Retry-After", 5)), 1)
+    except ValueError:
+        return 5
+
+
+# Function to send a get request to the API and return the decoded response
+def api_get(url: str, params: dict, headers: dict) -> dict:
+    params = {"format": "json", "formatversion": "2", "maxlag": MAXLAG, **params}
+    for attempt in range(MAX_RETRIES + 1):
+        with host_semaphore(url):
+            response = session.get(url, params=params, headers=headers, timeout=60)
+        # If the server is overloaded, lagged or the app sends too many requests, wait as long as the server asks
+        lagged = response.status_code == 200 and response.headers.get("MediaWiki-API-Error") == "maxlag"
+        if (lagged or response.status_code in (429, 503)) and attempt < MAX_RETRIES:
+            time.sleep(retry_after_seconds(response))
+            continue
+        break
+    response.raise_for_status()
+    # Measure the size of the response and the time needed to decode it
+    decode_start = time.perf_counter()
+    data = json.loads(response.content)
+    decode_seconds = time.perf_counter() - decode_start
+    api_statistics = current_api_statistics.get()
+    if api_statistics is not None:
+        with api_statistics_lock:
+            api_statistics["requests"] += 1
+            api_statistics["bytes"] += len(response.content)
+            api_statistics["decode_seconds"] += decode_seconds
+    # The API reports errors in the response body instead of the status code
+    if "error" in data:
+        raise RuntimeError(f"{data['error'].get('code')}: {data['error'].get('info')}")
+    return data
+
+
+# Function to get the description in the project language and the latest revision id of many Wikidata items
+# with one request per 50 items
+# Returns a dictionary {QID: {"qid": ..., "description": ..., "lastrevid": ...}}, items which do not exist are left out
+def get_wikidata_items_by_qid(qids: list, lang: str, headers: dict) -> dict:
+    items = {}
+    for batch in chunks(qids):
+        data = api_get(WIKIDATA_API_URL, {
+            "action": "wbgetentities",
+            "ids": "|".join(batch),
+            "props": "info|descriptions",
+            "languages": lang,
+        }, headers)
+        for qid, entity in data.get("entities", {}).items():
+            if "missing" in entity:
+                continue
+            description = entity.get("descriptions", {}).get(lang)
+            items[qid] = {
+                "qid": qid,
+                "description": description["value"] if description else "",
+                "lastrevid": entity.get("lastrevid"),
+            }
+    return items
+
+
+# Function to get the latest revision ids of many Wikidata items with one request per 50 items
+# Returns a dictionary {QID: latest revision id}, items which do not exist anymore are left out
+def get_lastrevids(qids: list, headers: dict) -> dict:
+    lastrevids = {}
+    for batch in chunks(qids):
+        data = api_get(WIKIDATA_API_URL, {
+            "action": "wbgetentities",
+            "ids": "|".join(batch),
+            "props": "info",
+        }, headers)
+        for qid, entity in data.get("entities", {}).items():
+            if "missing" not in entity and "lastrevid" in entity:
+                lastrevids[qid] = entity["lastrevid"]
+    return lastrevids
+
+
+# Function to find which requested title every page returned by action=query belongs to,
+# as the API returns the pages under their normalized titles and the targets of redirects
+def requested_titles_of_pages(query: dict, page_titles: list) -> dict:
+    requested_titles = {title: title for title in page_titles}
+    for normalized in query.get("normalized", []):
+        requested_titles[normalized["to"]] = requested_titles.get(normalized["from"], normalized["from"])
+    for redirect in query.get("redirects", []):
+        requested_titles[redirect["to"]] = requested_titles.get(redirect["from"], redirect["from"])
+    return requested_titles
+
+
+# Function to find the pages which many Wikipedia titles lead to (after normalization and following redirects),
+# with one request per 50 titles. The Wikidata item of every page is requested in the same request.
+# Returns a dictionary {requested title: {"title": ..., "pageid": ..., "ns": ..., "qid": ..., "redirect": ...}},
+# titles of missing pages and invalid titles get None, qid is "" for pages without an item
+def resolve_titles(page_titles: list, lang: str, headers: dict) -> dict:
+    resolved = {}
+    for batch in chunks(page_titles):
+        data = api_get(wikipedia_api_url(lang), {
+            "action": "query",
+            "prop": "pageprops",
+            "ppprop": "wikibase_item",
+            "redirects": 1,
+            "titles": "|".join(batch),
+        }, headers)
+        query = data.get("query", {})
+        normalized = {entry["from"]: entry["to"] for entry in query.get("normalized", [])}
+        redirects = {entry["from"]: entry["to"] for entry in query.get("redirects", [])}
+        pages = {page["title"]: page for page in query.get("pages", [])}
+        for title in batch:
+            normalized_title = normalized.get(title, title)
+            target_title = redirects.get(normalized_title, normalized_title)
+            page = pages.get(target_title)
+            if page is None or "invalid" in page or ("missing" in page and "special" not in page):
+                resolved[title] = None
+                continue
+            # Special pages exist, but have no page id
+            resolved[title] = {"title": page["title"], "pageid": page.get("pageid"), "ns": page["ns"],
+                               "qid": page.get("pageprops", {}).get("wikibase_item", ""),
+                               "redirect": normalized_title in redirects}
+    return resolved
+
+
+# Titles of the main pages of Wikipedias, downloaded only once
+main_page_titles = {}
+
+
+# Function to get the title of the main page of the Wikipedia in the given language
+def get_main_page_title(lang: str, headers: dict) -> str:
+    if lang not in main_page_titles:
+        data = api_get(wikipedia_api_url(lang), {
+            "action": "query",
+            "meta": "siteinfo",
+            "siprop": "general",
+        }, headers)
+        main_page_titles[lang] = data["query"]["general"]["mainpage"]
+    return main_page_titles[lang]
+
+
+# Function to get the page id and latest revision id of many Wikipedia pages with one request per 50 pages
+# Returns a dictionary {page title: {"pageid": ..., "lastrevid": ...}}, missing pages are left out
+def get_page_revisions(page_titles: list, lang: str, headers: dict) -> dict:
+    revisions = {}
+    for batch in chunks(page_titles):
+        data = api_get(wikipedia_api_url(lang), {
+            "action": "query",
+            "prop": "info",
+            "redirects": 1,
+            "titles": "|".join(batch),
+        }, headers)
+        query = data.get("query", {})
+        requested_titles = requested_titles_of_pages(query, batch)
+        for page in query.get("pages", []):
+            if "missing" not in page and "invalid" not in page:
+                revisions[requested_titles.get(page["title"], page["title"])] = {
+                    "pageid": page["pageid"], "lastrevid": page["lastrevid"]}
+    return revisions
+
+
+# Function to get the plain text of the introduction (the text before the first heading) of many Wikipedia pages,
+# with one request per 20 pages
+# Returns a dictionary {page title: {"text": introduction text, "pageid": ..., "lastrevid": ...}},
+# missing pages get an empty text and no ids
+def get_lead_texts(page_titles: list, lang: str, headers: dict) -> dict:
+    lead_texts = {}
+    for batch in chunks(page_titles, EXTRACTS_BATCH_SIZE):
+        data = api_get(wikipedia_api_url(lang), {
+            "action": "query",
+            # Get also the revision from which the text was extracted
+            "prop": "extracts|info",
+            "exintro": 1,
+            "explaintext": 1,
+            "exlimit": EXTRACTS_BATCH_SIZE,
+            "redirects": 1,
+            "titles": "|".join(batch),
+        }, headers)
+        query = data.get("query", {})
+        requested_titles = requested_titles_of_pages(query, batch)
+        for page in query.get("pages", []):
+            lead_texts[requested_titles.get(page["title"], page["title"])] = {
+                "text": page.get("extract", ""), "pageid": page.get("pageid"), "lastrevid": page.get("lastrevid")}
+    # Pages which were not returned at all get an empty text too
+    return {title: lead_texts.get(title, {"text": "", "pageid": None, "lastrevid": None}) for title in page_titles}
+
+
+# Function to get the number of pages, subcategories and files in a category with one request
+# Returns a dictionary {"pages": ..., "subcats": ..., "files": ...} or None if the category has no members
+# and no category page
+def get_category_info(category_title: str, lang: str, headers: dict):
+    data = api_get(wikipedia_api_url(lang), {
+        "action": "query",
+        "prop": "categoryinfo",
+        "titles": category_title,
+    }, headers)
+    page = data["query"]["pages"][0]
+    if "categoryinfo" not in page:
+        return None
+    return {key: page["categoryinfo"].get(key, 0) for key in ("pages", "subcats", "files")}
@@ -0,0 +1,136 @@
+# For turning the wikitext of the introduction into plain text
+import wikitextparser
+import html
+import re
+# For suggesting the descriptions in several processes at the same time
+import functools
+import itertools
+# For running the suggestions from the command line
+import sys
+import pandas as pd
+
+# For opening compressed dump files
+from pageview_dump import open_dump
+# For running the suggestions in several processes
+from wikidata_dump import map_in_processes
+# For storing the suggestions where generate_descriptions finds them
+from suggestion_cache import get_suggestion_cache
+# For suggesting the descriptions the same way as from the introductions downloaded from the API
+from description_extraction import DESCRIPTION_COPULAS, XML_DUMP_SOURCE, suggest_description, extractor_version
+from wikimedia_api import lang_to_dbname, normalize_title
+
+# Number of pages which are sent to a process at once
+XML_DUMP_BATCH_PAGES = 200
+# Table with the copulas in every language, the same one as the app uses
+I18N_PARSER_URL = "https://raw.githubusercontent.com/lukasmikulec/AddDesc_Database/refs/heads/main/i18n_parser.csv"
+
+# First heading of an article, the introduction ends before it
+HEADING = re.compile(r"^=+[^=\n].*=+[ \t]*$", re.MULTILINE)
+
+
+# Function to get the text between the tags of an element which is on one line, e.g. <title>...</title>
+def element_text(line: str) -> str:
+    return html.unescape(line[line.index(">") + 1:line.rindex("</")])
+
+
+# Function to go through a pages-articles XML dump (.xml, .xml.gz or .xml.bz2) line by line and yield
+# (page title, page id, revision id, wikitext) for the articles (namespace 0, not redirects) with the given titles
+# (or all articles if titles is None). The wikitext of the other pages is skipped without being decoded.
+def iterate_dump_pages(path: str, titles: set = None):
+    with open_dump(path) as dump:
+        lines = iter(dump)
+        for line in lines:
+            if not line.lstrip().startswith(b"<title>"):
+                continue
+            title = element_text(line.decode("utf-8"))
+            if titles is not None and title not in titles:
+                continue
+            pageid = revid = None
+            namespace = None
+            is_redirect = False
+            text_lines = []
+            for line in lines:
+                stripped = line.lstrip()
+                if stripped.startswith(b"</page>"):
+                    break
+                if stripped.startswith(b"<ns>"):
+                    namespace = int(element_text(stripped.decode("utf-8")))
+                elif stripped.startswith(b"<redirect"):
+                    is_redirect = True
+                # The first id is the id of the page, the second one the id of the revision
+                elif stripped.startswith(b"<id>") and revid is None:
+                    if pageid is None:
+                        pageid = int(element_text(stripped.decode("utf-8")))
+                    else:
+                        revid = int(element_text(stripped.decode("utf-8")))
+                elif stripped.startswith(b"<text"):
+                    if namespace != 0 or is_redirect or stripped.rstrip().endswith(b"/>"):
+                        continue
+                    # The text can be on many lines, from the end of the opening tag to the closing tag
+                    text = line.decode("utf-8")
+                    text_lines.append(text[text.index(">") + 1:])
+                    while "</text>" not in text_lines[-1]:
+                        text_lines.append(next(lines).decode("utf-8"))
+                    text_lines[-1] = text_lines[-1][:text_lines[-1].rindex("</text>")]
+            if namespace == 0 and not is_redirect and text_lines:
+                yield title, pageid, revid, html.unescape("".join(text_lines))
+
+
+# Function to get the plain text of the introduction (the text before the first heading) of an article
+# from its wikitext, without templates, references, files and categories
+def lead_plain_text(wikitext: str) -> str:
+    heading = HEADING.search(wikitext)
+    parsed = wikitextparser.parse(wikitext[:heading.start()] if heading else wikitext)
+    for reference in reversed(parsed.get_tags("ref")):
+        reference.string = ""
+    # Links with a namespace (files, categories, links to other languages) are not part of the text
+    for wikilink in reversed(parsed.wikilinks):
+        if ":" in wikilink.title:
+            wikilink.string = ""
+    return parsed.plain_text().strip()
+
+
+# Function to suggest the descriptions of a batch of pages, runs in other processes
+# Returns a list of (page id, revision id, suggestion)
+def suggest_batch(pages: list, copulas: list) -> list:
+    return [(pageid, revid, suggest_description(lead_plain_text(wikitext), copulas))
+            for title, pageid, revid, wikitext in pages]
+
+
+# Function to suggest the descriptions of the articles with the given titles (or of all articles) in a
+# pages-articles dump of the Wikipedia in the given language and store them in the suggestion cache,
+# where generate_descriptions uses them for the same revisions of the articles instead of downloading them.
+# Returns the number of stored suggestions
+def precompute_suggestions(path: str, lang: str, copulas: list, titles: list = None, processes: int = None) -> int:
+    wiki = lang_to_dbname(lang)
+    version = extractor_version(copulas, XML_DUMP_SOURCE)
+    suggestion_cache = get_suggestion_cache()
+    titles = {normalize_title(title) for title in titles} if titles is not None else None
+    batches = itertools.batched(iterate_dump_pages(path, titles), XML_DUMP_BATCH_PAGES)
+    stored = 0
+    for entries in map_in_processes(functools.partial(suggest_batch, copulas=copulas), batches, processes):
+        suggestion_cache.put(wiki, entries, version)
+        stored += len(entries)
+    return stored
+
+
+# Function to get the copulas of a language from the table of the app, the same ones as description_copulas gives
+def copulas_for_lang(lang: str, i18n_parser: pd.DataFrame) -> list:
+    copulas = []
+    for en_text, code in DESCRIPTION_COPULAS:
+        translated = i18n_parser.at[code, lang] if code in i18n_parser.index and lang in i18n_parser.columns else None
+        copulas.append(en_text if pd.isna(translated) or translated.strip() == "" else translated)
+    return copulas
+
+
+# Suggests the descriptions of the articles in a dump (all of them, or the ones listed in a file with one title
+# per line): python xml_dump.py dump_file lang [titles_file]
+if __name__ == "__main__":
+    i18n_parser = pd.read_csv(I18N_PARSER_URL, delimiter="|").set_index("code")
+    if len(sys.argv) > 3:
+        with open(sys.argv[3], encoding="utf-8") as titles_file:
+            titles = [line.strip() for line in titles_file if line.strip()]
+    else:
+        titles = None
+    print(f"{precompute_suggestions(sys.argv[1], sys.argv[2], copulas_for_lang(sys.argv[2], i18n_parser), titles)} "
+          f"suggestions stored")